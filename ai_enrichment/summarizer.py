@@ -1,17 +1,65 @@
 import os
+import json
+import tiktoken
+from concurrent.futures import ThreadPoolExecutor
 from openai import OpenAI
 from dotenv import load_dotenv
+from governor import OPENAI, CircuitOpen
 
 # Load variables from .env
 load_dotenv()
 
+MODEL = "gpt-4o-mini"
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL") or None   # None = api.openai.com
+BATCH_TOKEN_BUDGET = int(os.getenv("ENRICH_BATCH_TOKENS", "3000"))  # prompt tokens per batch request
+ITEM_OUTPUT_TOKENS = 150   # same answer size as a single enrich_update call
+MAX_BATCH_ITEMS = 20       # keeps the structured answer well under the output limit
+ENRICH_WORKERS = int(os.getenv("ENRICH_WORKERS", "4"))  # batch requests in flight at once
+
+INSTRUCTIONS = """Summarize the following EPA update and extract:
+    - Type of opportunity (funding, regulation, etc.)
+    - Affected region or sector
+    - Deadline or key dates
+    - Recommended action"""
+
 # Create client with API key
 api_key = os.getenv("OPENAI_API_KEY")
 if not api_key:
     print("⚠️ OPENAI_API_KEY not found in environment! Using raw text instead of enrichment.")
     client = None
 else:
-    client = OpenAI(api_key=api_key)
+    client = OpenAI(api_key=api_key, base_url=OPENAI_BASE_URL, max_retries=0, timeout=OPENAI.timeout)
+
+_encoding = None
+
+
+def _tokenizer():
+    global _encoding
+    if _encoding is None:
+        try:
+            _encoding = tiktoken.encoding_for_model(MODEL)
+        except Exception as e:
+            print(f"⚠️ tiktoken unavailable ({e}), estimating token counts")
+            _encoding = False
+    return _encoding
+
+
+def count_tokens(text: str) -> int:
+    """Token count for MODEL; falls back to a ~4 chars/token estimate offline."""
+    encoding = _tokenizer()
+    if not encoding:
+        return len(text) // 4 + 1
+    return len(encoding.encode(text))
+
+
+def trim_to_tokens(text: str, budget: int) -> str:
+    """The first `budget` tokens of `text` (same ~4 chars/token estimate offline)."""
+    encoding = _tokenizer()
+    if not encoding:
+        return text[:budget * 4]
+    tokens = encoding.encode(text)
+    return text if len(tokens) <= budget else encoding.decode(tokens[:budget])
+
 
 def enrich_update(text: str) -> str:
     """
@@ -22,23 +70,110 @@ def enrich_update(text: str) -> str:
         return text  # fallback: no enrichment
 
     prompt = f"""
-    Summarize the following EPA update and extract:
-    - Type of opportunity (funding, regulation, etc.)
-    - Affected region or sector
-    - Deadline or key dates
-    - Recommended action
+    {INSTRUCTIONS}
 
     Text: {text}
     """
 
     try:
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",  # ✅ correct new API
+        response = OPENAI.call_sync(lambda: client.chat.completions.create(
+            model=MODEL,  # ✅ correct new API
             messages=[{"role": "user", "content": prompt}],
             temperature=0.2,
-            max_tokens=150,
-        )
+            max_tokens=ITEM_OUTPUT_TOKENS,
+        ), "enrich_update")
         return response.choices[0].message.content.strip()
     except Exception as e:
         print(f"❌ Enrichment failed: {e}")
         return text  # fallback
+
+
+def make_batches(texts, token_budget: int = BATCH_TOKEN_BUDGET):
+    """Group indices of `texts` so each group's prompt stays within `token_budget`."""
+    overhead = count_tokens(INSTRUCTIONS) + 80   # instructions + JSON format note
+    batches, current, used = [], [], overhead
+
+    for i, text in enumerate(texts):
+        cost = count_tokens(text) + 10           # item header ("### id 3")
+        if current and (used + cost > token_budget or len(current) >= MAX_BATCH_ITEMS):
+            batches.append(current)
+            current, used = [], overhead
+        current.append(i)
+        used += cost
+
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _enrich_batch(texts) -> dict:
+    """One request for several updates; returns {position: summary}."""
+    items = "\n\n".join(f"### id {i}\n{text}" for i, text in enumerate(texts))
+    prompt = f"""
+    {INSTRUCTIONS}
+
+    Do this separately for each update below.
+    Answer with a JSON object: {{"items": [{{"id": <id>, "summary": "<text>"}}, ...]}}
+    with exactly one entry per id.
+
+    {items}
+    """
+
+    response = OPENAI.call_sync(lambda: client.chat.completions.create(
+        model=MODEL,
+        messages=[{"role": "user", "content": prompt}],
+        temperature=0.2,
+        max_tokens=ITEM_OUTPUT_TOKENS * len(texts) + 50,
+        response_format={"type": "json_object"},
+    ), "enrich_batch")
+    data = json.loads(response.choices[0].message.content)
+
+    results = {}
+    for item in data.get("items", []):
+        try:
+            i = int(item["id"])
+        except (KeyError, TypeError, ValueError):
+            continue
+        summary = str(item.get("summary") or "").strip()
+        if 0 <= i < len(texts) and summary:
+            results[i] = summary
+    return results
+
+
+def _enrich_batch_or_singles(texts) -> list:
+    if len(texts) == 1:
+        return [enrich_update(texts[0])]
+
+    try:
+        results = _enrich_batch(texts)
+    except CircuitOpen:
+        return list(texts)   # upstream down: raw text now instead of one doomed call per item
+    except Exception as e:
+        print(f"⚠️ Batch enrichment failed ({len(texts)} items), retrying one by one: {e}")
+        results = {}
+
+    return [results[pos] if pos in results else enrich_update(text) for pos, text in enumerate(texts)]
+
+
+def enrich_updates(texts, token_budget: int = BATCH_TOKEN_BUDGET, workers: int = ENRICH_WORKERS) -> list:
+    """
+    Batch version of enrich_update: packs as many texts as fit in `token_budget`
+    into each request and runs up to `workers` requests in parallel. Failed
+    batches (or items missing from the answer) fall back to one enrich_update
+    call per item. Order is preserved.
+    """
+    texts = list(texts)
+    if not client:
+        return texts  # fallback: no enrichment
+
+    batches = make_batches(texts, token_budget)
+    summaries = [None] * len(texts)
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        results = pool.map(_enrich_batch_or_singles, [[texts[i] for i in batch] for batch in batches])
+        for batch, batch_summaries in zip(batches, results):
+            for i, summary in zip(batch, batch_summaries):
+                summaries[i] = summary
+
+    print(f"🧠 Enriched {len(texts)} updates in {len(batches)} batch requests")
+    return summaries
@@ -0,0 +1,81 @@
+import os
+import asyncio
+import hashlib
+from openai import AsyncOpenAI
+from db import get_cached_summaries, store_summaries
+from governor import OPENAI
+
+MODEL = "gpt-4o-mini"
+MAX_CONCURRENCY = int(os.getenv("SUMMARY_CONCURRENCY", "5"))  # parallel OpenAI calls
+
+
+def text_key(text: str) -> str:
+    return hashlib.sha256(text.strip().encode("utf-8")).hexdigest()
+
+
+def fallback_summary(text: str) -> str:
+    return text[:150] + "..."   # ✅ return raw text, don't crash
+
+
+class SummaryService:
+    """
+    Non-blocking 25-word summaries.
+    Results are cached on disk by a hash of the input text, and concurrent
+    requests for the same text share one in-flight OpenAI call.
+    """
+
+    def __init__(self, api_key: str, concurrency: int = MAX_CONCURRENCY, base_url: str = None):
+        # retries/timeouts are the governor's job
+        self.client = AsyncOpenAI(api_key=api_key, base_url=base_url, max_retries=0) if api_key else None
+        self.limit = asyncio.Semaphore(concurrency)
+        self.inflight = {}
+
+    async def _complete(self, text: str):
+        """Call OpenAI; returns None when the call failed."""
+        if not self.client:
+            return None
+        async with self.limit:
+            try:
+                response = await OPENAI.call(lambda: self.client.chat.completions.create(
+                    model=MODEL,
+                    messages=[{"role": "user", "content": f"Summarize in 25 words:\n{text}"}],
+                ), "summarize")
+                return response.choices[0].message.content.strip()
+            except Exception as e:
+                print("⚠️ Summarization skipped:", e)
+                return None
+
+    def _shared(self, key: str, text: str) -> asyncio.Task:
+        task = self.inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._complete(text))
+            self.inflight[key] = task
+            task.add_done_callback(lambda _: self.inflight.pop(key, None))
+        return task
+
+    async def summarize(self, text: str) -> str:
+        return (await self.summarize_many([text]))[0]
+
+    async def summarize_many(self, texts) -> list:
+        """Summarize a batch in parallel, preserving order."""
+        keys = [text_key(t) if t else None for t in texts]
+        cached = await get_cached_summaries({k for k in keys if k})
+
+        pending = {}
+        for key, text in zip(keys, texts):
+            if key and key not in cached and key not in pending:
+                pending[key] = self._shared(key, text)
+
+        fresh = {}
+        if pending:
+            results = await asyncio.gather(*(asyncio.shield(t) for t in pending.values()))
+            fresh = {k: s for k, s in zip(pending, results) if s}
+            await store_summaries(fresh)
+
+        summaries = []
+        for key, text in zip(keys, texts):
+            if not key:
+                summaries.append("No summary available.")
+            else:
+                summaries.append(cached.get(key) or fresh.get(key) or fallback_summary(text))
+        return summaries
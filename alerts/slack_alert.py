@@ -1,9 +1,161 @@
 import os
-import requests
+import asyncio
+import httpx
+from governor import SLACK, CircuitOpen
 
 SLACK_WEBHOOK_URL = os.getenv("SLACK_WEBHOOK_URL")
+DIGEST_MAX_ITEMS = int(os.getenv("SLACK_DIGEST_MAX_ITEMS", "10"))         # items per digest message
+DIGEST_WINDOW_SECONDS = float(os.getenv("SLACK_DIGEST_WINDOW", "30"))     # oldest pending item waits at most this long
+QUEUE_SIZE = int(os.getenv("SLACK_QUEUE_SIZE", "1000"))                   # alerts buffered before new ones are dropped
+FLUSH_TIMEOUT = float(os.getenv("SLACK_FLUSH_TIMEOUT", "60"))             # seconds close() waits for the last digests
+
+
+def _escape(text: str) -> str:
+    """Slack mrkdwn control characters."""
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def format_digest(product: str, items) -> str:
+    header = f"🚨 *{len(items)} new update{'s' if len(items) != 1 else ''}: {_escape(product)}*"
+    lines = [
+        f"• <{link}|{_escape(title)}>" if link else f"• {_escape(title)}"
+        for title, link in items
+    ]
+    return "\n".join([header] + lines)
+
+
+class SlackDigestDispatcher:
+    """
+    Alerts are queued by alert() (never blocks) and posted by a background
+    task as one digest per product: a product's pending alerts go out together
+    once DIGEST_MAX_ITEMS have piled up or DIGEST_WINDOW_SECONDS after the
+    first of them, whichever comes first.
+
+    Posts go through governor.SLACK, one at a time (rate limit, retries with
+    backoff honouring Retry-After on 429, circuit breaker). While the breaker
+    is open, digests stay pending and are retried when it lets a probe through.
+    """
+
+    def __init__(self, url: str = SLACK_WEBHOOK_URL, max_items: int = DIGEST_MAX_ITEMS,
+                 window: float = DIGEST_WINDOW_SECONDS, queue_size: int = QUEUE_SIZE,
+                 transport: httpx.AsyncBaseTransport = None):
+        self.url = url
+        self.max_items = max_items
+        self.window = window
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.pending = {}    # product -> [(title, link)]
+        self.deadline = {}   # product -> loop time its digest is due
+        self.task = None
+        self._http = None
+        self._transport = transport   # tests: a local stand-in for the webhook
+        self._closing = False
+        self._held = set()   # products whose digest waits for the breaker
+        self.stats = {"queued": 0, "dropped": 0, "digests": 0, "sent": 0, "failed": 0}
+
+    def start(self):
+        """Start the background sender on the running loop (no-op without a webhook)."""
+        if self.url and self.task is None:
+            self._http = httpx.AsyncClient(timeout=SLACK.timeout, transport=self._transport)
+            self.task = asyncio.create_task(self._run())
+
+    def alert(self, product: str, title: str, link: str = None) -> bool:
+        """Queue one alert; returns False when it was dropped (no webhook or queue full)."""
+        if self.task is None:
+            return False
+        try:
+            self.queue.put_nowait((product or "General", title, link))
+        except asyncio.QueueFull:
+            self.stats["dropped"] += 1
+            return False
+        self.stats["queued"] += 1
+        return True
+
+    async def close(self, timeout: float = FLUSH_TIMEOUT):
+        """Send everything still queued or pending (up to `timeout` seconds), then stop."""
+        if self.task is None:
+            return
+        self._closing = True
+        try:
+            self.queue.put_nowait(None)   # wake the sender
+        except asyncio.QueueFull:
+            pass   # it is busy draining anyway
+        try:
+            await asyncio.wait_for(asyncio.shield(self.task), timeout)
+        except asyncio.TimeoutError:
+            self.task.cancel()
+            lost = sum(len(items) for items in self.pending.values()) + self.queue.qsize()
+            print(f"⏱️ Slack flush timed out, {lost} alerts not sent")
+        except Exception as e:
+            print(f"❌ Slack sender crashed: {e}")
+        finally:
+            await self._http.aclose()
+            self.task = None
+            print(f"📣 Slack alerts: {self.stats}")
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            now = loop.time()
+            closing = self._closing and self.queue.empty()
+            if closing and not self.pending:
+                return
+            due = [
+                p for p, items in self.pending.items()
+                if self.deadline[p] <= now
+                or (p not in self._held and (closing or len(items) >= self.max_items))
+            ]
+            for product in due:
+                items = self.pending.pop(product)
+                self.deadline.pop(product)
+                self._held.discard(product)
+                await self._send(product, items, loop)
+            if due:
+                continue
+
+            wait = max(min(self.deadline.values(), default=now + 3600) - now, 0)
+            if closing:
+                await asyncio.sleep(wait)   # only digests held by the breaker are left
+                continue
+            try:
+                item = await asyncio.wait_for(self.queue.get(), wait)
+            except asyncio.TimeoutError:
+                continue
+            if item is not None:
+                self._add(*item, loop.time())
+
+    def _add(self, product: str, title: str, link: str, now: float):
+        self.pending.setdefault(product, []).append((title, link))
+        self.deadline.setdefault(product, now + self.window)
+
+    async def _send(self, product: str, items, loop):
+        for start in range(0, len(items), self.max_items):
+            chunk = items[start:start + self.max_items]
+            payload = {"text": format_digest(product, chunk)}
+
+            async def post():
+                res = await self._http.post(self.url, json=payload)
+                res.raise_for_status()
+                return res
+
+            try:
+                await SLACK.call(post, "digest")
+            except CircuitOpen as e:
+                # ✅ keep the rest pending until the breaker lets a probe through
+                self.pending.setdefault(product, [])[:0] = items[start:]
+                self.deadline[product] = loop.time() + max(e.retry_in, 1.0)
+                self._held.add(product)
+                return
+            except Exception as e:
+                self.stats["failed"] += len(chunk)
+                print(f"⚠️ Slack digest for {product} failed: {e}")
+                continue
+            self.stats["digests"] += 1
+            self.stats["sent"] += len(chunk)
+
 
 def send_slack_alert(message):
+    """One-off blocking post (scripts); the pipeline uses SlackDigestDispatcher."""
     if SLACK_WEBHOOK_URL:
-        payload = {"text": message}
-        requests.post(SLACK_WEBHOOK_URL, json=payload)
+        def post():
+            httpx.post(SLACK_WEBHOOK_URL, json={"text": message}, timeout=SLACK.timeout).raise_for_status()
+        SLACK.call_sync(post, "alert")
@@ -0,0 +1,74 @@
+# bench/feed_parse.py
+"""
+Microbenchmark: parsing + cleaning one Google News style feed, the old way
+(feedparser over the whole document, a BeautifulSoup tree per summary) against
+scrapers.feed_parser (lxml stream stopping at the entry limit, regex cleaner).
+
+    python -m bench.feed_parse                        # 100-item feed, keep 10
+    python -m bench.feed_parse --items 20 --limit 10 --repeat 200
+"""
+import sys
+import json
+import time
+import argparse
+import statistics
+
+import feedparser
+from bs4 import BeautifulSoup
+
+from bench.stubs import rss_feed
+from scrapers.feed_parser import parse_entries, strip_tags, _fallback_entries
+
+
+def old_path(body: str, limit: int) -> list:
+    feed = feedparser.parse(body)
+    return [
+        (e.title, BeautifulSoup(getattr(e, "summary", ""), "html.parser").get_text(" ", strip=True), e.link)
+        for e in feed.entries[:limit]
+    ]
+
+
+def fast_path(body: str, limit: int) -> list:
+    return [(e["title"], strip_tags(e["summary"]), e["link"]) for e in parse_entries(body, limit)]
+
+
+def fallback_path(body: str, limit: int) -> list:
+    return [(e["title"], strip_tags(e["summary"]), e["link"]) for e in _fallback_entries(body, limit)]
+
+
+def timeit(fn, body: str, limit: int, repeat: int) -> dict:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(body, limit)
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        "p50_ms": round(statistics.median(samples), 3),
+        "p95_ms": round(samples[int(0.95 * (len(samples) - 1))], 3),
+        "feeds_per_s": round(1000 / statistics.mean(samples), 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=100, help="entries in the generated feed")
+    parser.add_argument("--limit", type=int, default=10, help="entries kept per feed")
+    parser.add_argument("--repeat", type=int, default=100)
+    args = parser.parse_args()
+
+    body = rss_feed("activated carbon", args.items)
+    expected = old_path(body, args.limit)
+    if fast_path(body, args.limit) != expected or fallback_path(body, args.limit) != expected:
+        print("❌ Parsers disagree on the sample feed", file=sys.stderr)
+        sys.exit(1)
+
+    results = {name: timeit(fn, body, args.limit, args.repeat)
+               for name, fn in (("feedparser+bs4", old_path), ("fast", fast_path), ("fallback", fallback_path))}
+    results["speedup"] = round(results["feedparser+bs4"]["p50_ms"] / results["fast"]["p50_ms"], 1)
+    print(json.dumps({"feed_bytes": len(body.encode()), "items": args.items, "limit": args.limit,
+                      "repeat": args.repeat, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,422 @@
+# bench/run.py
+"""
+Offline load test: starts the service stand-ins (bench/stubs.py) and the API
+(uvicorn main:app) against a throw-away database, runs the scenarios and
+prints throughput + p50/p95/p99 latency as JSON.
+
+    python -m bench.run                                   # every scenario
+    python -m bench.run --scenarios chat,ws_fanout --ws-clients 200
+    python -m bench.run --scenarios ws_fanout --api-workers 4    # clients spread over 4 uvicorn workers
+    python -m bench.run --out after.json --compare before.json
+"""
+import os
+import sys
+import json
+import math
+import time
+import random
+import shutil
+import asyncio
+import argparse
+import platform
+import tempfile
+import subprocess
+from urllib.parse import urlsplit, parse_qs
+
+import httpx
+import websockets
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCENARIOS = ["opportunities_miss", "opportunities_hit", "chat", "chat_stream", "ws_fanout", "run_daily"]
+PRODUCTS = ["PFAS", "Mining", "Gold Recovery", "Drinking Water", "EDLC"]
+QUESTIONS = [
+    "What funding is available for water utilities?",
+    "Any new PFAS regulation deadlines?",
+    "Which mining companies expand gold recovery capacity?",
+    "What is happening with supercapacitor carbon?",
+]
+
+
+# ======================================
+# 📊 RESULTS
+# ======================================
+def percentile(values: list, q: float):
+    """Nearest-rank percentile of an already sorted list."""
+    if not values:
+        return None
+    return values[max(0, math.ceil(q / 100 * len(values)) - 1)]
+
+
+def summarize(latencies: list, duration: float, errors: int = 0, **extra) -> dict:
+    """Latencies in seconds → the result record every scenario reports."""
+    ms = sorted(x * 1000 for x in latencies)
+    return {
+        "requests": len(ms) + errors,
+        "errors": errors,
+        "duration_s": round(duration, 3),
+        "throughput_rps": round(len(ms) / duration, 2) if duration else None,
+        "latency_ms": {
+            "p50": _round(percentile(ms, 50)),
+            "p95": _round(percentile(ms, 95)),
+            "p99": _round(percentile(ms, 99)),
+            "mean": _round(sum(ms) / len(ms)) if ms else None,
+            "max": _round(ms[-1]) if ms else None,
+        },
+        **extra,
+    }
+
+
+def _round(x):
+    return None if x is None else round(x, 2)
+
+
+def compare(baseline: dict, current: dict):
+    """Print p95 / throughput change per scenario against an earlier result file."""
+    print(f"📈 {baseline.get('commit')} → {current.get('commit')}", file=sys.stderr)
+    for name, now in current["scenarios"].items():
+        before = baseline.get("scenarios", {}).get(name)
+        if not before:
+            continue
+        p95_before, p95_now = before["latency_ms"]["p95"], now["latency_ms"]["p95"]
+        rps_before, rps_now = before["throughput_rps"], now["throughput_rps"]
+        p95 = f"{(p95_now - p95_before) / p95_before:+.1%}" if p95_before and p95_now is not None else "n/a"
+        rps = f"{(rps_now - rps_before) / rps_before:+.1%}" if rps_before and rps_now is not None else "n/a"
+        print(f"   {name:<20} p95 {p95_before} → {p95_now} ms ({p95})   "
+              f"throughput {rps_before} → {rps_now}/s ({rps})", file=sys.stderr)
+
+
+# ======================================
+# 🧰 PROCESSES
+# ======================================
+def bench_env(args, workdir: str) -> dict:
+    """Environment pointing main.py, news_scraper and summarizer at the stand-ins."""
+    stubs = f"http://127.0.0.1:{args.stub_port}"
+    return {
+        **os.environ,
+        "SCOUT_DB": os.path.join(workdir, "scout.db"),
+        "SCRAPER_STATE_DB": os.path.join(workdir, "scraper_state.db"),
+        "SERPER_URL": f"{stubs}/serper/news",
+        "SERPER_API_KEY": "bench",
+        "OPENAI_BASE_URL": f"{stubs}/openai/v1",
+        "OPENAI_API_KEY": "bench",
+        "GOOGLE_NEWS_RSS": f"{stubs}/rss/search",
+        "JACOBI_URL": f"{stubs}/jacobi/",
+        "SLACK_WEBHOOK_URL": f"{stubs}/slack/webhook",
+        "LIVE_POLL_SECONDS": str(args.live_poll_seconds),
+        "FULL_TEXT": "1" if args.full_text else "0",
+        "PYTHONUNBUFFERED": "1",
+    }
+
+
+def spawn(cmd: list, env: dict, log_path: str) -> subprocess.Popen:
+    log = open(log_path, "w")
+    return subprocess.Popen(cmd, cwd=ROOT, env=env, stdout=log, stderr=subprocess.STDOUT)
+
+
+async def wait_ready(url: str, proc: subprocess.Popen, timeout: float = 30):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as http:
+        while time.monotonic() < deadline:
+            if proc.poll() is not None:
+                raise RuntimeError(f"{' '.join(proc.args)} exited with {proc.returncode}")
+            try:
+                if (await http.get(url)).status_code < 500:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"{url} not ready after {timeout}s")
+
+
+def stop(proc: subprocess.Popen):
+    if proc and proc.poll() is None:
+        proc.terminate()
+        try:
+            proc.wait(10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+
+# ======================================
+# 🏃 SCENARIOS
+# ======================================
+async def closed_loop(total: int, concurrency: int, one):
+    """
+    Run `one(i)` `total` times with `concurrency` workers; returns summarize().
+    A call's latency is its wall time, unless `one` returns its own (seconds).
+    """
+    latencies, errors = [], 0
+    counter = iter(range(total))
+
+    async def worker():
+        nonlocal errors
+        for i in counter:
+            start = time.perf_counter()
+            try:
+                took = await one(i)
+                latencies.append(took if took is not None else time.perf_counter() - start)
+            except Exception as e:
+                errors += 1
+                if errors <= 3:
+                    print(f"⚠️ request {i} failed: {e!r}", file=sys.stderr)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, time.perf_counter() - start, errors, concurrency=concurrency)
+
+
+async def scenario_opportunities_miss(api: httpx.AsyncClient, args):
+    """Every request is for a product never seen: response cache miss → Serper + summaries + insert."""
+    run = random.randrange(1 << 30)
+
+    async def one(i):
+        res = await api.get("/opportunities", params={"product": f"Bench Miss {run}-{i}", "limit": 8})
+        res.raise_for_status()
+
+    return await closed_loop(args.requests, args.concurrency, one)
+
+
+async def scenario_opportunities_hit(api: httpx.AsyncClient, args):
+    """Same few product pages over and over: answered from the response cache."""
+    for product in PRODUCTS:
+        (await api.get("/opportunities", params={"product": product, "limit": 8})).raise_for_status()
+
+    async def one(i):
+        res = await api.get("/opportunities", params={"product": PRODUCTS[i % len(PRODUCTS)], "limit": 8})
+        res.raise_for_status()
+
+    result = await closed_loop(args.requests, args.concurrency, one)
+    result["cache"] = (await api.get("/cache/stats")).json()
+    return result
+
+
+async def scenario_chat(api: httpx.AsyncClient, args):
+    """Full JSON answers from /chat (retrieval + one completion)."""
+    async def one(i):
+        res = await api.post("/chat", json={
+            "message": QUESTIONS[i % len(QUESTIONS)], "product": PRODUCTS[i % len(PRODUCTS)],
+        })
+        res.raise_for_status()
+
+    return await closed_loop(args.requests, args.concurrency, one)
+
+
+async def scenario_chat_stream(api: httpx.AsyncClient, args):
+    """SSE /chat: latency is time to first token; total answer time is reported separately."""
+    totals = []
+
+    async def one(i):
+        start = time.perf_counter()
+        body = {"message": QUESTIONS[i % len(QUESTIONS)], "product": PRODUCTS[i % len(PRODUCTS)], "stream": True}
+        first = None
+        async with api.stream("POST", "/chat", json=body) as res:
+            res.raise_for_status()
+            async for line in res.aiter_lines():
+                if first is None and line.startswith("data:") and '"token"' in line:
+                    first = time.perf_counter()
+                if line.startswith("event: error"):
+                    raise RuntimeError("stream error event")
+        totals.append(time.perf_counter() - start)
+        if first is None:
+            raise RuntimeError("no tokens streamed")
+        return first - start   # reported instead of the whole call
+
+    result = await closed_loop(args.requests, args.concurrency, one)
+    total_ms = sorted(x * 1000 for x in totals)
+    result["metric"] = "time_to_first_token"
+    result["total_latency_ms"] = {f"p{q}": _round(percentile(total_ms, q)) for q in (50, 95, 99)}
+    return result
+
+
+async def scenario_ws_fanout(api: httpx.AsyncClient, args):
+    """
+    N clients subscribed to one topic while the live broadcaster polls the
+    Serper stand-in. Latency = stand-in response time → frame received, per
+    client per message (the stand-in stamps its clock into each link).
+    With --api-workers > 1 the clients land on different workers; every client
+    should still see the same seq numbers.
+    """
+    topic = f"Bench Live {random.randrange(1 << 30)}"
+    base = str(api.base_url).replace("http", "ws", 1).rstrip("/")
+    url = f"{base}/ws/updates?topics={topic.replace(' ', '%20')}"
+    latencies, received, seqs = [], 0, []
+    stop_at = None
+
+    async def client():
+        nonlocal received
+        mine = []
+        seqs.append(mine)
+        async with websockets.connect(url, max_queue=None) as ws:
+            ready.release()
+            while True:
+                timeout = stop_at - time.time() if stop_at else args.ws_seconds + 30
+                if timeout <= 0:
+                    return
+                try:
+                    frame = await asyncio.wait_for(ws.recv(), timeout)
+                except asyncio.TimeoutError:
+                    return
+                now = time.time()
+                msg = json.loads(frame)
+                mine.append(msg.get("seq"))
+                stamp = parse_qs(urlsplit(msg.get("link") or "").query).get("t")
+                if stamp:
+                    latencies.append(now - float(stamp[0]))
+                    received += 1
+
+    ready = asyncio.Semaphore(0)
+    tasks = [asyncio.create_task(client()) for _ in range(args.ws_clients)]
+    for _ in tasks:
+        await ready.acquire()   # every client connected before the clock starts
+    start = time.time()
+    stop_at = start + args.ws_seconds
+    await asyncio.gather(*tasks, return_exceptions=True)
+    duration = time.time() - start
+
+    result = summarize(latencies, duration, clients=args.ws_clients, metric="delivery_latency")
+    result["messages_per_client"] = round(received / args.ws_clients, 1) if args.ws_clients else 0
+    common = max(seqs, key=seqs.count, default=[])
+    result["clients_with_other_seqs"] = sum(1 for s in seqs if s != common)
+    result["hub"] = {k: v for k, v in (await api.get("/ws/stats")).json().items() if k != "connections"}
+    return result
+
+
+def scenario_run_daily(env: dict, args):
+    """Full run_daily.py passes in a child process: a cold pass, then warm ones (feeds answer 304)."""
+    code = (
+        "import asyncio, json, run_daily\n"
+        "from scrapers import article_text\n"
+        "timer = run_daily.StageTimer()\n"
+        "asyncio.run(run_daily.main(timer))\n"
+        "print('BENCH ' + json.dumps(timer.timings))\n"
+        "print('EXTRACT ' + json.dumps(article_text.last_run_stats))\n"
+    )
+    passes = []
+    for n in range(args.daily_passes):
+        start = time.perf_counter()
+        out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env, capture_output=True, text=True)
+        seconds = time.perf_counter() - start
+        timings = next((json.loads(line[6:]) for line in out.stdout.splitlines() if line.startswith("BENCH ")), None)
+        if out.returncode or timings is None:
+            print(out.stdout[-2000:], out.stderr[-2000:], file=sys.stderr)
+            raise RuntimeError(f"run_daily pass {n} failed")
+        extract = next((json.loads(line[8:]) for line in out.stdout.splitlines() if line.startswith("EXTRACT ")), {})
+        passes.append({"pass": "cold" if n == 0 else "warm", "wall_s": round(seconds, 3),
+                       "stages_s": {k: round(v, 3) for k, v in timings.items()}})
+        if extract:
+            passes[-1]["extract"] = extract
+
+    result = summarize([p["wall_s"] for p in passes], sum(p["wall_s"] for p in passes))
+    result["passes"] = passes
+    return result
+
+
+# ======================================
+# 🚀 MAIN
+# ======================================
+async def run(args) -> dict:
+    workdir = tempfile.mkdtemp(prefix="scout-bench-")
+    env = bench_env(args, workdir)
+    stubs = api_proc = None
+    results = {}
+    try:
+        stubs = spawn([sys.executable, "-m", "bench.stubs", "--port", str(args.stub_port),
+                       "--latency-ms", args.latency_ms, "--token-ms", str(args.token_ms),
+                       "--jitter", str(args.jitter), "--fail-rate", args.fail_rate], env, os.path.join(workdir, "stubs.log"))
+        await wait_ready(f"http://127.0.0.1:{args.stub_port}/stats", stubs)
+
+        # run_daily first: the opportunities it stores are what /chat retrieves
+        if "run_daily" in args.scenarios:
+            print("▶️ run_daily", file=sys.stderr)
+            results["run_daily"] = scenario_run_daily(env, args)
+
+        api_proc = spawn([sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1",
+                          "--port", str(args.api_port), "--workers", str(args.api_workers), "--log-level", "warning"],
+                         env, os.path.join(workdir, "api.log"))
+        await wait_ready(f"http://127.0.0.1:{args.api_port}/health", api_proc)
+
+        limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{args.api_port}", timeout=60, limits=limits) as api:
+            for name in args.scenarios:
+                if name == "run_daily":
+                    continue
+                print(f"▶️ {name}", file=sys.stderr)
+                results[name] = await globals()[f"scenario_{name}"](api, args)
+
+        async with httpx.AsyncClient() as http:
+            stub_calls = (await http.get(f"http://127.0.0.1:{args.stub_port}/stats")).json()
+    finally:
+        stop(api_proc)
+        stop(stubs)
+        if args.keep:
+            print(f"📁 Logs and databases kept in {workdir}", file=sys.stderr)
+        else:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    return {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "config": {
+            "requests": args.requests, "concurrency": args.concurrency, "ws_clients": args.ws_clients,
+            "ws_seconds": args.ws_seconds, "daily_passes": args.daily_passes, "api_workers": args.api_workers,
+            "latency_ms": stub_calls["latency_ms"], "fail_rate": stub_calls["fail_rate"], "token_ms": args.token_ms, "jitter": args.jitter,
+        },
+        "stub_calls": stub_calls["calls"],
+        "slack_received": stub_calls["slack"],
+        "scenarios": results,
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, text=True).strip()
+    except Exception:
+        return None
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help=f"comma-separated subset of {SCENARIOS}")
+    parser.add_argument("--requests", type=int, default=200, help="requests per HTTP scenario")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--ws-clients", type=int, default=100)
+    parser.add_argument("--ws-seconds", type=float, default=10)
+    parser.add_argument("--daily-passes", type=int, default=2, help="first pass cold, the rest warm")
+    parser.add_argument("--full-text", action="store_true", help="run_daily with the article extraction stage")
+    parser.add_argument("--live-poll-seconds", type=int, default=1)
+    parser.add_argument("--latency-ms", default="", help="stand-in latency, e.g. serper=80,rss=40,openai=300")
+    parser.add_argument("--token-ms", type=float, default=15)
+    parser.add_argument("--jitter", type=float, default=0.2)
+    parser.add_argument("--fail-rate", default="", help="injected upstream errors, e.g. openai=0.3,serper=0.5")
+    parser.add_argument("--stub-port", type=int, default=8765)
+    parser.add_argument("--api-port", type=int, default=8766)
+    parser.add_argument("--api-workers", type=int, default=1, help="uvicorn --workers for the API")
+    parser.add_argument("--out", help="also write the JSON result to this file")
+    parser.add_argument("--compare", help="earlier result file to diff against")
+    parser.add_argument("--keep", action="store_true", help="keep the temp dir with logs and databases")
+    args = parser.parse_args(argv)
+
+    args.scenarios = [s.strip() for s in args.scenarios.split(",") if s.strip()]
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    result = asyncio.run(run(args))
+
+    text = json.dumps(result, indent=2)
+    print(text)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text + "\n")
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f), result)
+
+
+if __name__ == "__main__":
+    main()
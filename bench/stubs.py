@@ -0,0 +1,260 @@
+# bench/stubs.py
+"""
+Local stand-ins for the outside services, for offline benchmarks:
+
+    POST /serper/news                       google.serper.dev/news
+    GET  /rss/search?q=...                  Google News RSS (ETag / If-None-Match → 304)
+    GET  /jacobi/                           Jacobi homepage
+    GET  /article/{slug}                    news article pages (linked from the RSS items)
+    POST /openai/v1/chat/completions        OpenAI chat completions (JSON, json_object, stream)
+    POST /slack/webhook                     Slack incoming webhook (429 + Retry-After under --fail-rate slack=...)
+
+Run:  python -m bench.stubs --port 8765 --latency-ms serper=80,rss=40,openai=300
+      python -m bench.stubs --fail-rate openai=0.3      # 30% of OpenAI calls get 429/503
+"""
+import re
+import json
+import time
+import random
+import asyncio
+import hashlib
+import argparse
+import itertools
+from email.utils import formatdate
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
+
+DEFAULT_LATENCY_MS = {"serper": 80, "rss": 40, "jacobi": 40, "article": 60, "openai": 300, "slack": 50}
+DEFAULT_TOKEN_MS = 15        # gap between streamed answer tokens
+DEFAULT_JITTER = 0.2         # ± fraction applied to every delay
+RSS_ITEMS = 20
+PUBLISHERS = ["Reuters", "Water World", "Mining Weekly", "Chemical Week", "EPA News"]
+WORDS = (
+    "carbon filtration plant utilities regulation funding grant mining gold recovery pfas "
+    "water treatment battery anode supercapacitor remediation soil emissions capacity"
+).split()
+
+app = FastAPI(title="Market Scout service stand-ins")
+app.state.latency_ms = dict(DEFAULT_LATENCY_MS)
+app.state.token_ms = DEFAULT_TOKEN_MS
+app.state.jitter = DEFAULT_JITTER
+app.state.fail_rate = {}
+app.state.calls = {}
+app.state.slack = {"messages": 0, "items": 0}
+_serial = itertools.count(1)
+
+
+async def delay(service: str):
+    """
+    Sleep for the configured latency of `service` (± jitter) and count the call.
+    Returns an error response (alternately 429 with Retry-After, and 503) for the
+    configured share of calls, else None.
+    """
+    calls = app.state.calls[service] = app.state.calls.get(service, 0) + 1
+    ms = app.state.latency_ms.get(service, 0)
+    if ms:
+        await asyncio.sleep(ms * random.uniform(1 - app.state.jitter, 1 + app.state.jitter) / 1000)
+    if random.random() < app.state.fail_rate.get(service, 0):
+        if calls % 2:
+            return JSONResponse({"error": "rate limited"}, status_code=429, headers={"Retry-After": "1"})
+        return JSONResponse({"error": "unavailable"}, status_code=503)
+    return None
+
+
+def sentence(seed: str, words: int = 12) -> str:
+    rnd = random.Random(seed)
+    return " ".join(rnd.choice(WORDS) for _ in range(words)).capitalize()
+
+
+# ======================================
+# 🌍 SERPER
+# ======================================
+@app.post("/serper/news")
+async def serper_news(request: Request):
+    body = await request.json()
+    q, num = body.get("q", ""), int(body.get("num", 10))
+    if failure := await delay("serper"):
+        return failure
+
+    # ✅ Fresh items on every call (so the live broadcaster always has news); the
+    # creation time rides along in the link for end-to-end delivery latency.
+    now = time.time()
+    news = []
+    for i in range(num):
+        n = next(_serial)
+        news.append({
+            "title": f"{q}: {sentence(f'{q}-{n}', 8)}",
+            "link": f"https://bench.local/serper/{n}?t={now:.6f}",
+            "snippet": f"{sentence(f'{q}-{n}-snippet', 30)} ({q} #{n})",
+            "date": f"{i + 1} hours ago",
+            "source": PUBLISHERS[n % len(PUBLISHERS)],
+        })
+    return {"news": news}
+
+
+# ======================================
+# 📰 RSS + JACOBI
+# ======================================
+def rss_feed(q: str, count: int = RSS_ITEMS, base: str = "https://bench.local") -> str:
+    items = []
+    for i in range(count):
+        title = f"{sentence(f'{q}-{i}', 9)} - {PUBLISHERS[i % len(PUBLISHERS)]}"
+        items.append(f"""
+    <item>
+      <title>{title}</title>
+      <link>{base}/article/{hashlib.md5(f'{q}-{i}'.encode()).hexdigest()}</link>
+      <guid isPermaLink="false">{q}-{i}</guid>
+      <pubDate>{formatdate(1_750_000_000 - i * 3600, usegmt=True)}</pubDate>
+      <description>&lt;a href="https://bench.local/{i}"&gt;{title}&lt;/a&gt;&amp;nbsp;&amp;nbsp;&lt;font color="#6f6f6f"&gt;{PUBLISHERS[i % len(PUBLISHERS)]}&lt;/font&gt; {sentence(f'{q}-{i}-d', 25)}</description>
+    </item>""")
+    return f"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0"><channel><title>"{q}" - Google News</title>{''.join(items)}
+</channel></rss>"""
+
+
+@app.get("/rss/search")
+async def rss_search(request: Request, q: str = ""):
+    if failure := await delay("rss"):
+        return failure
+    body = rss_feed(q, base=str(request.base_url).rstrip("/"))
+    etag = '"' + hashlib.sha1(body.encode()).hexdigest() + '"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(body, media_type="application/rss+xml", headers={"ETag": etag})
+
+
+@app.get("/jacobi/")
+async def jacobi():
+    if failure := await delay("jacobi"):
+        return failure
+    links = "".join(f'<a href="news/{i}">{sentence(f"jacobi-{i}", 6)}</a>' for i in range(8))
+    return Response(f"<html><body>{links}</body></html>", media_type="text/html")
+
+
+def article_page(slug: str, paragraphs: int = 12) -> str:
+    """A news page with the usual chrome around the story."""
+    nav = "".join(f'<li><a href="/section/{w}">{w.title()}</a></li>' for w in WORDS[:12])
+    story = "".join(f"<p>{sentence(f'{slug}-{i}', 40)}.</p>" for i in range(paragraphs))
+    related = "".join(f'<li><a href="/article/{slug}{i}">{sentence(f"{slug}-rel-{i}", 7)}</a></li>' for i in range(6))
+    return f"""<!DOCTYPE html><html><head><title>{sentence(slug, 8)}</title>
+<script>window.dataLayer = [{{"page": "{slug}"}}];</script><style>body {{ font-family: sans-serif }}</style></head>
+<body><header><nav><ul>{nav}</ul></nav></header>
+<main><article><h1>{sentence(slug, 8)}</h1><p class="byline">By {PUBLISHERS[len(slug) % len(PUBLISHERS)]} staff</p>
+{story}</article><aside><h2>Related</h2><ul>{related}</ul></aside></main>
+<footer><p>© Bench News. All rights reserved.</p><a href="/privacy">Privacy</a></footer></body></html>"""
+
+
+@app.get("/article/{slug}")
+async def article(slug: str):
+    if failure := await delay("article"):
+        return failure
+    return Response(article_page(slug), media_type="text/html")
+
+
+# ======================================
+# 🧠 OPENAI
+# ======================================
+def completion_text(messages: list) -> str:
+    prompt = messages[-1]["content"] if messages else ""
+    return sentence(prompt[-200:], 25) + "."
+
+
+def batch_answer(prompt: str) -> str:
+    """Answer for summarizer._enrich_batch: one item per "### id N" section."""
+    ids = [int(i) for i in re.findall(r"^\s*### id (\d+)", prompt, re.M)]
+    return json.dumps({"items": [{"id": i, "summary": sentence(f"{prompt[:100]}-{i}", 25)} for i in ids]})
+
+
+@app.post("/openai/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    messages = body.get("messages", [])
+    created = int(time.time())
+    completion_id = f"chatcmpl-bench{next(_serial)}"
+
+    if (body.get("response_format") or {}).get("type") == "json_object":
+        content = batch_answer(messages[-1]["content"])
+    else:
+        content = completion_text(messages)
+
+    if body.get("stream"):
+        if failure := await delay("openai"):   # time to first token
+            return failure
+
+        async def chunks():
+            for token in re.findall(r"\S+\s*", content):
+                delta = {"id": completion_id, "object": "chat.completion.chunk", "created": created,
+                         "model": body.get("model"),
+                         "choices": [{"index": 0, "delta": {"content": token}, "finish_reason": None}]}
+                yield f"data: {json.dumps(delta)}\n\n"
+                await asyncio.sleep(app.state.token_ms / 1000)
+            done = {"id": completion_id, "object": "chat.completion.chunk", "created": created,
+                    "model": body.get("model"), "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]}
+            yield f"data: {json.dumps(done)}\n\n"
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(chunks(), media_type="text/event-stream")
+
+    if failure := await delay("openai"):
+        return failure
+    return JSONResponse({
+        "id": completion_id,
+        "object": "chat.completion",
+        "created": created,
+        "model": body.get("model"),
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+        "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+    })
+
+
+# ======================================
+# 📣 SLACK
+# ======================================
+@app.post("/slack/webhook")
+async def slack_webhook(request: Request):
+    body = await request.json()
+    if failure := await delay("slack"):
+        return failure
+    if not isinstance(body.get("text"), str) or not body["text"]:
+        return Response("no_text", status_code=400)
+    app.state.slack["messages"] += 1
+    app.state.slack["items"] += body["text"].count("\n•")
+    return Response("ok", media_type="text/plain")
+
+
+@app.get("/stats")
+def stats():
+    return {"calls": app.state.calls, "latency_ms": app.state.latency_ms, "fail_rate": app.state.fail_rate,
+            "slack": app.state.slack}
+
+
+def parse_spec(spec: str, defaults: dict = None) -> dict:
+    """"serper=80,openai=300" → {"serper": 80.0, "openai": 300.0} (on top of `defaults`)."""
+    values = dict(defaults or {})
+    for part in filter(None, (spec or "").split(",")):
+        name, _, value = part.partition("=")
+        values[name.strip()] = float(value)
+    return values
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", default="", help="per service, e.g. serper=80,rss=40,openai=300")
+    parser.add_argument("--token-ms", type=float, default=DEFAULT_TOKEN_MS)
+    parser.add_argument("--jitter", type=float, default=DEFAULT_JITTER)
+    parser.add_argument("--fail-rate", default="", help="share of failing calls per service, e.g. openai=0.3")
+    args = parser.parse_args()
+
+    app.state.latency_ms = parse_spec(args.latency_ms, DEFAULT_LATENCY_MS)
+    app.state.fail_rate = parse_spec(args.fail_rate)
+    app.state.token_ms = args.token_ms
+    app.state.jitter = args.jitter
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
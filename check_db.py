@@ -1,18 +1,19 @@
 import sqlite3
+from db import DB_NAME
 
-# Connect to your SQLite database file
-conn = sqlite3.connect("market_scout.db")
+# Connect to the unified SQLite store (created/migrated by db.init_db)
+conn = sqlite3.connect(DB_NAME)
 cur = conn.cursor()
 
-# Check if opportunities table exists
-cur.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='opportunities';")
+# Check if articles table exists
+cur.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='articles';")
 table_exists = cur.fetchone()
 
 if not table_exists:
-    print("⚠️ Table 'opportunities' does not exist in market_scout.db")
+    print(f"⚠️ Table 'articles' does not exist in {DB_NAME} (run fix_db.py)")
 else:
     # Fetch some rows
-    cur.execute("SELECT id, title, source, date FROM opportunities LIMIT 5;")
+    cur.execute("SELECT id, title, source, date FROM articles WHERE kind = 'opportunity' LIMIT 5;")
     rows = cur.fetchall()
 
     if not rows:
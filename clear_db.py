@@ -1,10 +1,11 @@
-from database.models import SessionLocal, Opportunity
+import sqlite3
+from db import DB_NAME
 
-db = SessionLocal()
+conn = sqlite3.connect(DB_NAME)
 
-# Delete all rows from opportunities table
-db.query(Opportunity).delete()
-db.commit()
-db.close()
+# Delete all daily-job opportunities (cached news is kept); FTS triggers keep search in sync
+conn.execute("DELETE FROM articles WHERE kind = 'opportunity';")
+conn.commit()
+conn.close()
 
-print("✅ Cleared all records from opportunities table")
+print("✅ Cleared all opportunities")
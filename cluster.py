@@ -0,0 +1,157 @@
+# cluster.py
+import os
+import time
+import fcntl
+import socket
+import asyncio
+
+import db
+from ws_hub import RING_SIZE
+
+LEADER_LOCK = os.getenv("LEADER_LOCK") or f"{db.DB_NAME}.leader"
+LEADER_RETRY_SECONDS = float(os.getenv("LEADER_RETRY_SECONDS", "5"))   # followers re-try the lock this often
+RELAY_POLL_SECONDS = float(os.getenv("RELAY_POLL_SECONDS", "0.2"))     # outbox tail interval per worker
+INTEREST_SECONDS = float(os.getenv("INTEREST_SECONDS", "5"))           # topic heartbeat; 3 missed = gone
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+
+class LeaderLock:
+    """Non-blocking flock on a file next to the DB; the OS frees it when the holder exits or dies."""
+
+    def __init__(self, path: str = LEADER_LOCK):
+        self.path = path
+        self._fd = None
+
+    @property
+    def held(self) -> bool:
+        return self._fd is not None
+
+    def try_acquire(self) -> bool:
+        if self._fd is not None:
+            return True
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return False
+        os.ftruncate(fd, 0)
+        os.write(fd, WORKER_ID.encode())   # who leads, for humans
+        self._fd = fd
+        return True
+
+    def release(self):
+        if self._fd is None:
+            return
+        fcntl.flock(self._fd, fcntl.LOCK_UN)
+        os.close(self._fd)
+        self._fd = None
+
+
+class LiveRelay:
+    """
+    Live updates across uvicorn workers (uvicorn --workers N):
+
+    - one worker at a time holds the LeaderLock and runs the broadcaster, so
+      Serper is polled once per topic however many workers there are; the
+      others retry every LEADER_RETRY_SECONDS and take over when it exits
+    - the leader appends each update to the live_outbox table; every worker
+      tails it and fans it out to its own sockets, so seq numbers (and
+      ?since= replay) are the same on every worker
+    - every worker advertises its clients' topics in live_interest, and the
+      leader polls the union
+
+    Only live updates are shared. The governor buckets and concurrency limits,
+    the SummaryService semaphore, ResponseCache invalidation (insert listeners)
+    and the single-flight `refreshing` map stay per process, so N workers allow
+    N times the configured Serper/OpenAI rates and can serve a cached response
+    another worker has made stale. The Procfile therefore defaults to one
+    worker; raise WEB_CONCURRENCY only after dividing the *_RPS, *_BURST,
+    *_MAX_CONCURRENCY and SUMMARY_CONCURRENCY settings by it, and accepting up
+    to RESPONSE_CACHE_TTL of staleness.
+    """
+
+    def __init__(self, hub, lock: LeaderLock = None):
+        self.hub = hub
+        self.lock = lock or LeaderLock()
+        self.relayed = 0     # messages fanned out from the outbox (not published here)
+        self.published = 0
+        self.elections = 0   # times this worker became leader
+        self._tasks = []
+
+    @property
+    def is_leader(self) -> bool:
+        return self.lock.held
+
+    async def start(self, lead):
+        """Start tailing and advertising; `lead` (the broadcaster) runs whenever this worker leads."""
+        self.hub.preload(await db.get_live_recent(RING_SIZE))
+        self._tasks = [
+            asyncio.create_task(self._tail()),
+            asyncio.create_task(self._advertise()),
+            asyncio.create_task(self._elect(lead)),
+        ]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self.lock.release()
+        await db.clear_live_interest(WORKER_ID)
+
+    async def wanted_topics(self) -> set:
+        """Topics subscribed to on any live worker."""
+        return self.hub.subscribed_topics() | await db.get_live_interest(3 * INTEREST_SECONDS)
+
+    async def publish(self, message: dict, topic: str) -> int:
+        """Leader only: store the update for the other workers and queue it locally; returns receivers."""
+        seq, text = await db.publish_live(topic, message, min_seq=int(time.time() * 1000), keep=RING_SIZE)
+        self.published += 1
+        if seq <= self.hub.seq:
+            return 0   # the tail got there first
+        return self.hub.deliver(seq, topic, text)
+
+    async def _tail(self):
+        while True:
+            try:
+                for seq, topic, text in await db.get_live_after(self.hub.seq):
+                    if seq > self.hub.seq:
+                        self.hub.deliver(seq, topic, text)
+                        self.relayed += 1
+            except Exception as e:
+                print("🔴 Live relay tail failed:", e)
+            await asyncio.sleep(RELAY_POLL_SECONDS)
+
+    async def _advertise(self):
+        advertised, beat = None, 0.0
+        while True:
+            topics = self.hub.subscribed_topics()
+            if topics != advertised or time.monotonic() - beat >= INTEREST_SECONDS:
+                try:
+                    await db.set_live_interest(WORKER_ID, topics, expire_after=3 * INTEREST_SECONDS)
+                    advertised, beat = topics, time.monotonic()
+                except Exception as e:
+                    print("🔴 Topic heartbeat failed:", e)
+            await asyncio.sleep(RELAY_POLL_SECONDS)
+
+    async def _elect(self, lead):
+        while True:
+            if self.lock.try_acquire():
+                self.elections += 1
+                print(f"👑 Worker {WORKER_ID} leads the live broadcaster")
+                try:
+                    await lead()
+                except Exception as e:
+                    print("🔴 Live broadcaster failed, stepping down:", e)
+                finally:
+                    self.lock.release()
+            await asyncio.sleep(LEADER_RETRY_SECONDS)
+
+    def stats(self) -> dict:
+        return {
+            "worker": WORKER_ID,
+            "leader": self.is_leader,
+            "elections": self.elections,
+            "published": self.published,
+            "relayed": self.relayed,
+        }
@@ -1,47 +1,710 @@
 # db.py
+import os
+import re
+import json
+import time
+import html
+import base64
+import asyncio
 import aiosqlite
 from asyncio import Lock
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from metrics import timed_db
+
+# ✅ One store for both sources: Serper news cached by the API + opportunities from run_daily.py
+DB_NAME = os.getenv("SCOUT_DB", "scout.db")
+LEGACY_NEWS_DB = "news_cache.db"             # imported once by migration 3
+LEGACY_OPPORTUNITIES_DB = "market_scout.db"  # imported once by migration 3
+READER_COUNT = int(os.getenv("DB_READERS", "4"))
+
+# ✅ The one place SQLite is tuned (applied to every pooled connection)
+PRAGMAS = [
+    ("journal_mode", "WAL"),     # readers don't block the writer
+    ("synchronous", "NORMAL"),   # durable at checkpoints, no fsync per commit (safe with WAL)
+    ("busy_timeout", 5000),
+    ("temp_store", "MEMORY"),
+    ("cache_size", -1024 * int(os.getenv("SQLITE_CACHE_MB", "64"))),          # negative = KiB
+    ("mmap_size", 1024 * 1024 * int(os.getenv("SQLITE_MMAP_MB", "256"))),
+]
+
+NEWS = "news"                 # article kinds
+OPPORTUNITY = "opportunity"
 
-DB_NAME = "news_cache.db"
 _write_lock = Lock()  # ✅ prevent concurrent DB writes
+_open_lock = Lock()
 
-async def init_db():
-    async with aiosqlite.connect(DB_NAME) as db:
-        await db.execute("PRAGMA journal_mode=WAL;")  # ✅ allow concurrent writes
+# ✅ Long-lived pool: one writer + N readers, opened once by init_db()
+_writer = None
+_readers = None
+
+# ✅ Callbacks run as fn(kind, product, articles) after new rows are written (cache invalidation, retrieval index)
+_insert_listeners = []
+
+
+def add_insert_listener(fn):
+    _insert_listeners.append(fn)
+
+
+def to_epoch(raw_date):
+    """ISO date string → UTC epoch seconds (None when unparsable)."""
+    try:
+        pub_date = datetime.fromisoformat((raw_date or "").replace("Z", "+00:00"))
+    except (TypeError, ValueError):
+        return None
+    if pub_date.tzinfo is None:
+        pub_date = pub_date.replace(tzinfo=timezone.utc)
+    return int(pub_date.timestamp())
+
+
+async def _connect(readonly: bool = False):
+    conn = await aiosqlite.connect(DB_NAME)
+    for name, value in PRAGMAS:
+        await conn.execute(f"PRAGMA {name}={value};")
+    if readonly:
+        await conn.execute("PRAGMA query_only=ON;")
+    await conn.create_function("to_epoch", 1, to_epoch, deterministic=True)
+    return conn
+
+
+# ======================================
+# 🧱 MIGRATIONS (tracked in PRAGMA user_version, applied by init_db)
+# ======================================
+async def _m001_articles(db):
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS articles (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            kind TEXT NOT NULL,
+            product TEXT,
+            products TEXT,
+            title TEXT NOT NULL,
+            summary TEXT,
+            source TEXT,
+            date TEXT,
+            published_epoch INTEGER,
+            link TEXT NOT NULL UNIQUE,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    await db.execute("""
+        CREATE INDEX IF NOT EXISTS idx_articles_product_epoch
+        ON articles (product, published_epoch)
+    """)
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS summary_cache (
+            text_hash TEXT PRIMARY KEY,
+            summary TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS product_refresh (
+            product TEXT PRIMARY KEY,
+            refreshed_at INTEGER
+        )
+    """)
+
+
+async def _m002_search_index(db):
+    """External-content FTS5 table over (title, summary), kept in sync by triggers."""
+    await db.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+            title, summary, content='articles', content_rowid='id', tokenize='porter unicode61'
+        )
+    """)
+    await db.execute("""
+        CREATE TRIGGER IF NOT EXISTS articles_fts_ai AFTER INSERT ON articles BEGIN
+            INSERT INTO articles_fts(rowid, title, summary) VALUES (new.id, new.title, new.summary);
+        END
+    """)
+    await db.execute("""
+        CREATE TRIGGER IF NOT EXISTS articles_fts_ad AFTER DELETE ON articles BEGIN
+            INSERT INTO articles_fts(articles_fts, rowid, title, summary) VALUES ('delete', old.id, old.title, old.summary);
+        END
+    """)
+    await db.execute("""
+        CREATE TRIGGER IF NOT EXISTS articles_fts_au AFTER UPDATE ON articles BEGIN
+            INSERT INTO articles_fts(articles_fts, rowid, title, summary) VALUES ('delete', old.id, old.title, old.summary);
+            INSERT INTO articles_fts(rowid, title, summary) VALUES (new.id, new.title, new.summary);
+        END
+    """)
+    await db.execute("INSERT INTO articles_fts(articles_fts) VALUES ('rebuild')")
+
+
+async def _m003_import_legacy(db):
+    """Copy rows out of the old split stores (attached by _migrate when present)."""
+    attached = await _attached(db)
+
+    if "legacy_news" in attached:
+        print(f"➡️ Importing cached news from {LEGACY_NEWS_DB}...")
         await db.execute("""
-            CREATE TABLE IF NOT EXISTS news_cache (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                product TEXT,
-                title TEXT UNIQUE,
-                summary TEXT,
-                source TEXT,
-                date TEXT,
-                link TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
+            INSERT OR IGNORE INTO articles
+                (kind, product, products, title, summary, source, date, published_epoch, link, created_at)
+            SELECT 'news', product, product, title, summary, source, date, to_epoch(date),
+                   COALESCE(link, title), created_at
+            FROM legacy_news.news_cache
         """)
-        await db.commit()
+        result = await db.execute("SELECT 1 FROM legacy_news.sqlite_master WHERE name = 'summary_cache'")
+        if await result.fetchone():
+            await db.execute("""
+                INSERT OR IGNORE INTO summary_cache (text_hash, summary, created_at)
+                SELECT text_hash, summary, created_at FROM legacy_news.summary_cache
+            """)
+
+    if "legacy_opportunities" in attached:
+        print(f"➡️ Importing opportunities from {LEGACY_OPPORTUNITIES_DB}...")
+        result = await db.execute("PRAGMA legacy_opportunities.table_info(opportunities);")
+        columns = [col[1] for col in await result.fetchall()]
+        products = "COALESCE(products, product)" if "products" in columns else "product"
+        await db.execute(f"""
+            INSERT OR IGNORE INTO articles
+                (kind, product, products, title, summary, source, date, published_epoch, link)
+            SELECT 'opportunity', product, {products}, title, summary, source, date, to_epoch(date),
+                   COALESCE(link, title)
+            FROM legacy_opportunities.opportunities
+        """)
+
+
+async def _m004_live_updates(db):
+    """Outbox the leader worker appends live updates to, and the topics each worker's clients want."""
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS live_outbox (
+            seq INTEGER PRIMARY KEY,
+            topic TEXT,
+            message TEXT NOT NULL,
+            created_at REAL NOT NULL
+        )
+    """)
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS live_interest (
+            worker TEXT PRIMARY KEY,
+            topics TEXT NOT NULL,
+            updated_at REAL NOT NULL
+        )
+    """)
+
+
+def split_products(products, product=None) -> list:
+    """articles.products ("A, B") → ["A", "B"]; `product` when it is empty."""
+    names = [p.strip() for p in (products or "").split(",") if p.strip()]
+    return list(dict.fromkeys(names)) or ([product] if product else [])
+
+
+async def _m005_article_products(db):
+    """
+    One row per (product, article) so a story collapsed into several products
+    is listed under each; published_epoch is copied in so product pages are
+    read, filtered and ordered from the index alone.
+    """
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS article_products (
+            article_id INTEGER NOT NULL,
+            product TEXT NOT NULL,
+            published_epoch INTEGER,
+            UNIQUE (article_id, product)
+        )
+    """)
+    await db.execute("""
+        CREATE INDEX IF NOT EXISTS idx_article_products_product_epoch
+        ON article_products (product, published_epoch, article_id)
+    """)
+    await db.execute("""
+        CREATE TRIGGER IF NOT EXISTS article_products_ad AFTER DELETE ON articles BEGIN
+            DELETE FROM article_products WHERE article_id = old.id;
+        END
+    """)
+    # ✅ Backfill rows written before (including the legacy import of migration 3)
+    result = await db.execute("SELECT id, product, products, published_epoch FROM articles")
+    await db.executemany(
+        "INSERT OR IGNORE INTO article_products (article_id, product, published_epoch) VALUES (?, ?, ?)",
+        [(r[0], name, r[3]) for r in await result.fetchall() for name in split_products(r[2], r[1])],
+    )
+
+
+MIGRATIONS = [
+    (1, _m001_articles),
+    (2, _m002_search_index),
+    (3, _m003_import_legacy),
+    (4, _m004_live_updates),
+    (5, _m005_article_products),
+]
+LEGACY_IMPORT_VERSION = 3
+LEGACY_STORES = [
+    ("legacy_news", LEGACY_NEWS_DB, "news_cache"),
+    ("legacy_opportunities", LEGACY_OPPORTUNITIES_DB, "opportunities"),
+]
 
-async def insert_article(product, article):
+
+async def _attached(db) -> set:
+    result = await db.execute("PRAGMA database_list;")
+    return {r[1] for r in await result.fetchall()}
+
+
+async def _user_version(db) -> int:
+    result = await db.execute("PRAGMA user_version;")
+    return (await result.fetchone())[0]
+
+
+async def _migrate(db):
+    """
+    Apply pending MIGRATIONS in order, each in its own BEGIN IMMEDIATE
+    transaction with the version re-checked inside it, so several processes
+    starting at once apply every migration exactly once.
+    """
+    version = await _user_version(db)
+    if version >= MIGRATIONS[-1][0]:
+        return
+
+    # ATTACH is not allowed inside a transaction: attach legacy stores up front
+    legacy = []
+    for schema, path, table in LEGACY_STORES if version < LEGACY_IMPORT_VERSION else ():
+        if not os.path.exists(path) or os.path.abspath(path) == os.path.abspath(DB_NAME):
+            continue
+        await db.execute(f"ATTACH DATABASE ? AS {schema}", (path,))
+        legacy.append(schema)
+        result = await db.execute(f"SELECT 1 FROM {schema}.sqlite_master WHERE type = 'table' AND name = ?", (table,))
+        if not await result.fetchone():
+            await db.execute(f"DETACH DATABASE {schema}")
+            legacy.remove(schema)
+
+    try:
+        for version, migration in MIGRATIONS:
+            await db.execute("BEGIN IMMEDIATE")
+            try:
+                if await _user_version(db) < version:
+                    print(f"➡️ Migration {version}: {migration.__name__}")
+                    await migration(db)
+                    await db.execute(f"PRAGMA user_version = {version}")
+                await db.commit()
+            except Exception:
+                await db.rollback()
+                raise
+    finally:
+        for schema in legacy:
+            await db.execute(f"DETACH DATABASE {schema}")
+
+
+async def init_db():
+    """Open the pool and bring the schema up to date (safe to call repeatedly)."""
+    global _writer, _readers
+    async with _open_lock:
+        if _writer is not None:
+            return
+
+        writer = await _connect()
+        await _migrate(writer)
+
+        readers = asyncio.Queue()
+        for _ in range(READER_COUNT):
+            readers.put_nowait(await _connect(readonly=True))
+
+        _writer, _readers = writer, readers
+
+
+async def close_db():
+    """Close every pooled connection (called on shutdown)."""
+    global _writer, _readers
+    async with _open_lock:
+        if _writer is None:
+            return
+        async with _write_lock:
+            await _writer.close()
+        while not _readers.empty():
+            await _readers.get_nowait().close()
+        _writer, _readers = None, None
+
+
+@asynccontextmanager
+async def _reader():
+    if _readers is None:
+        await init_db()
+    readers = _readers
+    conn = await readers.get()
+    try:
+        yield conn
+    finally:
+        readers.put_nowait(conn)
+
+
+@asynccontextmanager
+async def _transaction():
+    if _writer is None:
+        await init_db()
     async with _write_lock:  # ✅ only 1 write at a time
-        async with aiosqlite.connect(DB_NAME) as db:
-            await db.execute("""
-                INSERT OR IGNORE INTO news_cache (product, title, summary, source, date, link)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (product, article["title"], article["summary"], article["source"], article["date"], article["link"]))
-            await db.commit()
+        try:
+            yield _writer
+            await _writer.commit()
+        except Exception:
+            await _writer.rollback()
+            raise
+
+
+def _notify(kind, product, articles):
+    for fn in _insert_listeners:
+        fn(kind, product, articles)
+
+
+def _as_article(r):
+    return {"title": r[0], "summary": r[1], "source": r[2], "date": r[3], "link": r[4]}
+
+
+# ======================================
+# 🔎 FULL-TEXT SEARCH (FTS5 over news + opportunities)
+# ======================================
+def fts_query(text: str) -> str:
+    """User input → safe FTS5 query: every word must match, last word as a prefix."""
+    words = re.findall(r"\w+", text.lower())
+    if not words:
+        return ""
+    terms = [f'"{w}"' for w in words]
+    terms[-1] += "*"
+    return " ".join(terms)
+
+
+MARK_OPEN, MARK_CLOSE = "\x02", "\x03"   # FTS highlight sentinels, swapped for <mark> after escaping
+
 
+def marked_html(text):
+    """FTS highlight()/snippet() output → HTML: the text escaped, the sentinels as <mark> tags."""
+    if text is None:
+        return None
+    return html.escape(text).replace(MARK_OPEN, "<mark>").replace(MARK_CLOSE, "</mark>")
+
+
+def encode_search_cursor(rank, kind, row_id) -> str:
+    return base64.urlsafe_b64encode(f"{rank!r}|{kind}|{row_id}".encode()).decode()
+
+
+def decode_search_cursor(cursor: str):
+    rank, kind, row_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+    return float(rank), kind, int(row_id)
+
+
+@timed_db("read")
+async def search_articles(text, product=None, since_epoch=None, limit=20, cursor=None):
+    """
+    BM25-ranked search over cached news and daily opportunities, with
+    <mark>-highlighted snippets. Returns (results, next_cursor).
+
+    title_highlight and snippet are HTML (escaped, safe to render as markup);
+    title and summary are plain text, as stored.
+    """
+    match = fts_query(text)
+    if not match:
+        return [], None
+
+    inner = """
+        SELECT a.kind, a.id, a.title, a.summary, a.source, a.date, a.link, a.product,
+               bm25(articles_fts, 10.0, 1.0) AS rank,
+               highlight(articles_fts, 0, char(2), char(3)) AS title_hl,
+               snippet(articles_fts, 1, char(2), char(3), '…', 24) AS snippet
+        FROM articles_fts JOIN articles a ON a.id = articles_fts.rowid
+        WHERE articles_fts MATCH ?
+    """
+    params = [match]
+    if product:
+        inner += " AND a.id IN (SELECT article_id FROM article_products WHERE product = ?)"
+        params.append(product)
+    if since_epoch is not None:
+        inner += " AND a.published_epoch >= ?"
+        params.append(since_epoch)
+
+    sql = f"SELECT * FROM ({inner})"
+    if cursor:
+        sql += " WHERE (rank, kind, id) > (?, ?, ?)"
+        params += list(cursor)
+    sql += " ORDER BY rank, kind, id LIMIT ?"
+    params.append(limit)
+
+    async with _reader() as db:
+        result = await db.execute(sql, params)
+        rows = await result.fetchall()
+
+    results = [
+        {
+            "kind": r[0], "title": r[2], "summary": r[3], "source": r[4], "date": r[5],
+            "link": r[6], "product": r[7], "score": -r[8], "title_highlight": marked_html(r[9]), "snippet": marked_html(r[10]),
+        }
+        for r in rows
+    ]
+    next_cursor = encode_search_cursor(rows[-1][8], rows[-1][0], rows[-1][1]) if len(rows) == limit else None
+    return results, next_cursor
+
+
+# ======================================
+# ✍️ WRITES
+# ======================================
+ARTICLE_COLUMNS = "kind, product, products, title, summary, source, date, published_epoch, link"
+INSERT_CHUNK = 100   # rows per INSERT statement (9 parameters each, under SQLite's limit)
+
+
+async def _insert(kind, items, rows) -> int:
+    """
+    INSERT OR IGNORE one batch of `kind` rows (and their article_products
+    entries) in one transaction, then notify the insert listeners per primary
+    product with the items actually written.
+    rows[i] is items[i] as (product, products, title, summary, source, date,
+    published_epoch, link). Returns the number of new rows.
+    """
+    if not rows:
+        return 0
+    inserted = {}   # link -> new article id
+    placeholders = "(" + ", ".join("?" * 9) + ")"
+    async with _transaction() as db:
+        for i in range(0, len(rows), INSERT_CHUNK):
+            part = rows[i:i + INSERT_CHUNK]
+            # ✅ RETURNING lists only rows written: stored links and in-batch repeats are left out
+            result = await db.execute(
+                f"INSERT OR IGNORE INTO articles ({ARTICLE_COLUMNS}) "
+                f"VALUES {', '.join([placeholders] * len(part))} RETURNING link, id",
+                [value for row in part for value in (kind, *row)],
+            )
+            inserted.update(await result.fetchall())
+
+        new_rows = {row[-1]: row for row in rows if row[-1] in inserted}
+        await db.executemany(
+            "INSERT OR IGNORE INTO article_products (article_id, product, published_epoch) VALUES (?, ?, ?)",
+            [(inserted[link], name, row[6]) for link, row in new_rows.items() for name in split_products(row[1], row[0])],
+        )
+
+    by_product, notified = {}, set()
+    for item, row in zip(items, rows):
+        product, link = row[0], row[-1]
+        if link in inserted and link not in notified:
+            notified.add(link)
+            by_product.setdefault(product, []).append(item)
+    for product, new_items in by_product.items():
+        _notify(kind, product, new_items)
+    return len(inserted)
+
+
+@timed_db("write")
+async def insert_articles_bulk(product, articles):
+    """Write a whole Serper fetch in one transaction; returns the number of new rows."""
+    return await _insert(NEWS, articles, [
+        (product, product, a["title"], a["summary"], a["source"], a["date"],
+         to_epoch(a["date"]), a.get("link") or a["title"])
+        for a in articles
+    ])
+
+
+@timed_db("write")
+async def insert_opportunities(opportunities):
+    """
+    Write the daily job's enriched items (dicts with title, summary, source,
+    date, link, product, products) in one transaction; links already stored
+    are skipped. Returns the number of new rows.
+    """
+    return await _insert(OPPORTUNITY, opportunities, [
+        (o["product"], ", ".join(o.get("products") or [o["product"]]), o["title"],
+         o["summary"], o["source"], o["date"], to_epoch(o["date"]), o["link"])
+        for o in opportunities
+    ])
+
+
+@timed_db("write")
+async def mark_refreshed(product, age_seconds=0):
+    """Record that `product` was just refreshed from the news API (as if `age_seconds` ago)."""
+    async with _transaction() as db:
+        await db.execute(
+            "INSERT OR REPLACE INTO product_refresh (product, refreshed_at) VALUES (?, strftime('%s', 'now') - ?)",
+            (product, age_seconds),
+        )
+
+
+@timed_db("write")
+async def store_summaries(summaries):
+    """Persist {text_hash: summary} in one transaction."""
+    if not summaries:
+        return
+    async with _transaction() as db:
+        await db.executemany(
+            "INSERT OR REPLACE INTO summary_cache (text_hash, summary) VALUES (?, ?)",
+            list(summaries.items()),
+        )
+
+
+# ======================================
+# 📖 READS (shared by main.py and run_daily.py)
+# ======================================
+@timed_db("read")
 async def get_cached_articles(product, limit=10):
-    async with aiosqlite.connect(DB_NAME) as db:
+    async with _reader() as db:
         cursor = await db.execute("""
-            SELECT title, summary, source, date, link FROM news_cache
-            WHERE product = ?
-            ORDER BY created_at DESC
+            SELECT a.title, a.summary, a.source, a.date, a.link
+            FROM article_products p JOIN articles a ON a.id = p.article_id
+            WHERE p.product = ?
+            ORDER BY a.created_at DESC
             LIMIT ?
         """, (product, limit))
         rows = await cursor.fetchall()
 
+    return [_as_article(r) for r in rows]
+
+
+@timed_db("read")
+async def query_articles(product, since_epoch, order="desc", skip=0, limit=8, cursor=None):
+    """
+    One page of `product` articles (news and opportunities, including stories
+    collapsed into another product) published at/after `since_epoch`, ordered
+    by publish time. `cursor` is the (published_epoch, id) of the last row of
+    the previous page (keyset pagination); otherwise `skip` rows are skipped.
+    Returns (articles, next_cursor).
+    """
+    desc = order != "asc"
+    direction = "DESC" if desc else "ASC"
+    # ✅ Filter, order and page on the (product, published_epoch, article_id) index, then look rows up
+    sql = """
+        SELECT a.title, a.summary, a.source, a.date, a.link, p.published_epoch, p.article_id
+        FROM article_products p JOIN articles a ON a.id = p.article_id
+        WHERE p.product = ? AND p.published_epoch >= ?
+    """
+    params = [product, since_epoch]
+
+    if cursor:
+        sql += f" AND (p.published_epoch, p.article_id) {'<' if desc else '>'} (?, ?)"
+        params += list(cursor)
+        skip = 0
+
+    sql += f" ORDER BY p.published_epoch {direction}, p.article_id {direction} LIMIT ? OFFSET ?"
+    params += [limit, skip]
+
+    async with _reader() as db:
+        result = await db.execute(sql, params)
+        rows = await result.fetchall()
+
+    next_cursor = (rows[-1][5], rows[-1][6]) if len(rows) == limit else None
+    return [_as_article(r) for r in rows], next_cursor
+
+
+@timed_db("read")
+async def existing_links(links, chunk=500):
+    """Subset of `links` already stored; one IN query per `chunk` (under SQLite's parameter limit)."""
+    links = list(links)
+    found = set()
+    async with _reader() as db:
+        for i in range(0, len(links), chunk):
+            part = links[i:i + chunk]
+            result = await db.execute(
+                f"SELECT link FROM articles WHERE link IN ({','.join('?' * len(part))})", part
+            )
+            found.update(r[0] for r in await result.fetchall())
+    return found
+
+
+@timed_db("read")
+async def get_passages_after(last_id=0):
+    """Rows for the retrieval index written after `last_id`, as (id, kind, doc) tuples."""
+    async with _reader() as db:
+        result = await db.execute("""
+            SELECT id, kind, title, summary, source, date, link, product FROM articles
+            WHERE id > ? ORDER BY id
+        """, (last_id,))
+        rows = await result.fetchall()
+
     return [
-        {"title": r[0], "summary": r[1], "source": r[2], "date": r[3], "link": r[4]}
+        (r[0], r[1], {"title": r[2], "summary": r[3], "source": r[4], "date": r[5] or "", "link": r[6], "product": r[7]})
         for r in rows
     ]
+
+
+@timed_db("read")
+async def get_last_refresh(product):
+    """Epoch seconds of the last refresh of `product` (None if never)."""
+    async with _reader() as db:
+        result = await db.execute(
+            "SELECT refreshed_at FROM product_refresh WHERE product = ?", (product,)
+        )
+        row = await result.fetchone()
+    return row[0] if row else None
+
+
+@timed_db("read")
+async def get_cached_summaries(text_hashes):
+    """Return {text_hash: summary} for the hashes already summarized."""
+    text_hashes = list(text_hashes)
+    if not text_hashes:
+        return {}
+    placeholders = ",".join("?" * len(text_hashes))
+    async with _reader() as db:
+        cursor = await db.execute(
+            f"SELECT text_hash, summary FROM summary_cache WHERE text_hash IN ({placeholders})",
+            text_hashes,
+        )
+        rows = await cursor.fetchall()
+    return {r[0]: r[1] for r in rows}
+
+
+# ======================================
+# 📡 LIVE UPDATES (cross-worker outbox, see cluster.py)
+# ======================================
+@timed_db("write")
+async def publish_live(topic, message, min_seq, keep):
+    """
+    Append `message` to the outbox under the next seq (at least `min_seq`) and
+    trim it to the newest `keep` rows. Returns (seq, serialized message).
+    """
+    async with _transaction() as db:
+        result = await db.execute("SELECT MAX(seq) FROM live_outbox")
+        last = (await result.fetchone())[0] or 0
+        seq = max(min_seq, last + 1)
+        text = json.dumps({**message, "seq": seq})
+        await db.execute(
+            "INSERT INTO live_outbox (seq, topic, message, created_at) VALUES (?, ?, ?, ?)",
+            (seq, topic, text, time.time()),
+        )
+        await db.execute(
+            "DELETE FROM live_outbox WHERE seq < (SELECT seq FROM live_outbox ORDER BY seq DESC LIMIT 1 OFFSET ?)",
+            (keep - 1,),
+        )
+    return seq, text
+
+
+@timed_db("read")
+async def get_live_after(seq, limit=500):
+    """Outbox rows newer than `seq` as [(seq, topic, text)], oldest first."""
+    async with _reader() as db:
+        result = await db.execute(
+            "SELECT seq, topic, message FROM live_outbox WHERE seq > ? ORDER BY seq LIMIT ?", (seq, limit)
+        )
+        return await result.fetchall()
+
+
+@timed_db("read")
+async def get_live_recent(limit):
+    """The newest `limit` outbox rows as [(seq, topic, text)], oldest first."""
+    async with _reader() as db:
+        result = await db.execute(
+            "SELECT seq, topic, message FROM live_outbox ORDER BY seq DESC LIMIT ?", (limit,)
+        )
+        rows = await result.fetchall()
+    return rows[::-1]
+
+
+@timed_db("write")
+async def set_live_interest(worker, topics, expire_after):
+    """Record the topics `worker`'s clients want; drops workers silent for `expire_after` seconds."""
+    now = time.time()
+    async with _transaction() as db:
+        await db.execute(
+            "INSERT OR REPLACE INTO live_interest (worker, topics, updated_at) VALUES (?, ?, ?)",
+            (worker, json.dumps(sorted(topics)), now),
+        )
+        await db.execute("DELETE FROM live_interest WHERE updated_at < ?", (now - expire_after,))
+
+
+@timed_db("write")
+async def clear_live_interest(worker):
+    async with _transaction() as db:
+        await db.execute("DELETE FROM live_interest WHERE worker = ?", (worker,))
+
+
+@timed_db("read")
+async def get_live_interest(max_age):
+    """Union of the topics wanted by workers heard from in the last `max_age` seconds."""
+    async with _reader() as db:
+        result = await db.execute(
+            "SELECT topics FROM live_interest WHERE updated_at >= ?", (time.time() - max_age,)
+        )
+        rows = await result.fetchall()
+    return {topic for (topics,) in rows for topic in json.loads(topics)}
@@ -1,20 +1,21 @@
+import asyncio
 import sqlite3
+from db import DB_NAME, MIGRATIONS, init_db, close_db
 
-DB_PATH = "market_scout.db"
 
-conn = sqlite3.connect(DB_PATH)
-cur = conn.cursor()
+async def migrate():
+    # ✅ Schema changes are versioned migrations in db.py, applied on open
+    await init_db()
+    await close_db()
 
-# Check if 'product' column exists
-cur.execute("PRAGMA table_info(opportunities);")
-columns = [col[1] for col in cur.fetchall()]
 
-if "product" not in columns:
-    print("➡️ Adding missing 'product' column...")
-    cur.execute("ALTER TABLE opportunities ADD COLUMN product TEXT;")
-    conn.commit()
-    print("✅ Column added successfully")
-else:
-    print("✔️ 'product' column already exists")
+asyncio.run(migrate())
 
+conn = sqlite3.connect(DB_NAME)
+version = conn.execute("PRAGMA user_version;").fetchone()[0]
 conn.close()
+
+if version >= MIGRATIONS[-1][0]:
+    print(f"✔️ {DB_NAME} is at schema version {version}")
+else:
+    print(f"⚠️ {DB_NAME} is at schema version {version}, expected {MIGRATIONS[-1][0]}")
@@ -0,0 +1,292 @@
+# governor.py
+import os
+import time
+import random
+import asyncio
+import threading
+from collections import deque
+
+import httpx
+import openai
+import metrics
+
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+
+class CircuitOpen(Exception):
+    """Raised without calling the upstream while its breaker is open."""
+
+    def __init__(self, provider: str, retry_in: float):
+        super().__init__(f"{provider} circuit open, retry in {retry_in:.0f}s")
+        self.provider = provider
+        self.retry_in = retry_in
+
+
+def _status(exc):
+    return getattr(getattr(exc, "response", None), "status_code", None)
+
+
+def _retry_after(exc):
+    """Seconds from a Retry-After header (None when absent or an HTTP date)."""
+    headers = getattr(getattr(exc, "response", None), "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+def is_retryable(exc) -> bool:
+    if isinstance(exc, (asyncio.TimeoutError, httpx.TransportError, openai.APIConnectionError)):
+        return True   # includes timeouts of both clients
+    return _status(exc) in RETRYABLE_STATUS
+
+
+class Governor:
+    """
+    Every call to one upstream goes through here:
+
+    - token bucket: at most `rate` calls/s (bursts up to `burst`), paused after a 429
+    - adaptive concurrency (AIMD): +1 slot per window of fast successes, halved on
+      429/5xx/timeouts, trimmed when latency exceeds `target_latency`
+    - retries with full-jitter backoff, bounded by a per-call `deadline`
+    - circuit breaker: `failure_threshold` consecutive upstream failures open it for
+      `cooldown` seconds; calls then fail fast with CircuitOpen so callers serve
+      cached data, and one probe call is let through when the cooldown ends
+
+    Async callers share the concurrency limit; sync callers (run_daily.py
+    enrichment threads, already bounded by ENRICH_WORKERS) share the bucket,
+    retries and breaker.
+    """
+
+    def __init__(self, name: str, rate: float, burst: int, max_concurrency: int,
+                 target_latency: float, timeout: float, deadline: float, retries: int = 2,
+                 failure_threshold: int = 5, cooldown: float = 30.0,
+                 backoff_base: float = 0.25, backoff_cap: float = 4.0):
+        self.name = name
+        self.rate, self.burst = rate, burst
+        self.max_concurrency = max_concurrency
+        self.target_latency = target_latency
+        self.timeout, self.deadline, self.retries = timeout, deadline, retries
+        self.failure_threshold, self.cooldown = failure_threshold, cooldown
+        self.backoff_base, self.backoff_cap = backoff_base, backoff_cap
+
+        self._lock = threading.Lock()
+        self.tokens = float(burst)
+        self._refilled = time.monotonic()
+        self._paused_until = 0.0            # Retry-After from the last 429
+
+        self.limit = float(max(1, max_concurrency // 2))   # current concurrency (AIMD)
+        self.in_flight = 0
+        self._waiters = deque()             # futures of async calls waiting for a slot
+
+        self.failures = 0                   # consecutive upstream failures
+        self.opened_until = 0.0
+        self._probing = False
+
+        self.stats = {"calls": 0, "retries": 0, "rejected": 0, "throttled": 0, "opened": 0}
+
+    # ---------- circuit breaker ----------
+    @property
+    def state(self) -> str:
+        if self.failures < self.failure_threshold:
+            return "closed"
+        return "open" if time.monotonic() < self.opened_until else "half_open"
+
+    def available(self) -> bool:
+        """False while the breaker is open (a call would fail fast)."""
+        return self.state != "open"
+
+    def _admit(self) -> bool:
+        """Raise CircuitOpen, or return True when this attempt is the half-open probe."""
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return False
+            if state == "half_open" and not self._probing:
+                self._probing = True    # exactly one probe
+                return True
+            self.stats["rejected"] += 1
+            raise CircuitOpen(self.name, max(0.0, self.opened_until - time.monotonic()))
+
+    def _end_probe(self):
+        """A probe that ends without a result (deadline, cancellation) frees the slot for the next one."""
+        with self._lock:
+            self._probing = False
+
+    def _record(self, ok: bool, seconds: float = None, exc=None):
+        with self._lock:
+            self._probing = False
+            if ok:
+                self.failures = 0
+                if seconds is not None and seconds > self.target_latency:
+                    self.limit = max(1.0, self.limit * 0.9)
+                else:
+                    self.limit = min(float(self.max_concurrency), self.limit + 1 / self.limit)
+                return
+
+            status = _status(exc)
+            if status == 429:
+                self.stats["throttled"] += 1
+                self._paused_until = time.monotonic() + (_retry_after(exc) or self.backoff_cap)
+            self.limit = max(1.0, self.limit / 2)
+            self.failures += 1
+            if self.failures >= self.failure_threshold:
+                if self.failures == self.failure_threshold or self.opened_until <= time.monotonic():
+                    self.stats["opened"] += 1
+                    print(f"🧯 {self.name} circuit open for {self.cooldown:.0f}s after {self.failures} failures")
+                self.opened_until = time.monotonic() + self.cooldown
+
+    # ---------- token bucket ----------
+    def _take_token(self) -> float:
+        """Take a token; returns 0, or how long to wait before trying again."""
+        with self._lock:
+            now = time.monotonic()
+            if now < self._paused_until:
+                return self._paused_until - now
+            self.tokens = min(self.burst, self.tokens + (now - self._refilled) * self.rate)
+            self._refilled = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            return (1 - self.tokens) / self.rate
+
+    # ---------- adaptive concurrency ----------
+    async def _acquire(self):
+        while True:
+            with self._lock:
+                if self.in_flight < int(self.limit):
+                    self.in_flight += 1
+                    return
+                waiter = asyncio.get_running_loop().create_future()
+                self._waiters.append(waiter)
+            await waiter
+
+    def _release(self):
+        with self._lock:
+            self.in_flight -= 1
+            free = int(self.limit) - self.in_flight
+            while free > 0 and self._waiters:
+                waiter = self._waiters.popleft()
+                if not waiter.done():
+                    waiter.set_result(None)
+                    free -= 1
+
+    def _after_failure(self, exc, attempt: int, give_up: float) -> float:
+        """Record a failed attempt; returns the backoff before the next one, or re-raises."""
+        retryable = is_retryable(exc)
+        if retryable:
+            self._record(False, exc=exc)
+        else:
+            self._record(True)   # e.g. 400/401: our request is wrong, the upstream is fine
+        delay = random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** attempt))
+        delay = max(delay, _retry_after(exc) or 0.0)
+        if not retryable or attempt >= self.retries or time.monotonic() + delay >= give_up:
+            raise exc
+        self.stats["retries"] += 1
+        return delay
+
+    # ---------- calls ----------
+    async def call(self, fn, operation: str):
+        """Await `fn()` (a coroutine factory) under the governor; raises the last error or CircuitOpen."""
+        self.stats["calls"] += 1
+        give_up = time.monotonic() + self.deadline
+        for attempt in range(self.retries + 1):
+            probe = self._admit()
+            try:
+                while (wait := self._take_token()) > 0:
+                    if time.monotonic() + wait > give_up:
+                        raise asyncio.TimeoutError(f"{self.name} rate limit wait exceeds deadline")
+                    await asyncio.sleep(wait)
+
+                await self._acquire()
+                start = time.perf_counter()
+                try:
+                    timeout = min(self.timeout, max(give_up - time.monotonic(), 0.01))
+                    with metrics.outbound(self.name, operation):
+                        result = await asyncio.wait_for(fn(), timeout)
+                except Exception as exc:
+                    error = exc
+                else:
+                    self._record(True, time.perf_counter() - start)
+                    return result
+                finally:
+                    self._release()
+
+                delay = self._after_failure(error, attempt, give_up)
+            finally:
+                if probe:
+                    self._end_probe()   # ✅ whatever happened, the breaker must not wait on this probe
+            await asyncio.sleep(delay)
+
+    def call_sync(self, fn, operation: str):
+        """Blocking twin of call() for worker threads; per-attempt timeouts come from the client."""
+        self.stats["calls"] += 1
+        give_up = time.monotonic() + self.deadline
+        for attempt in range(self.retries + 1):
+            probe = self._admit()
+            try:
+                while (wait := self._take_token()) > 0:
+                    if time.monotonic() + wait > give_up:
+                        raise TimeoutError(f"{self.name} rate limit wait exceeds deadline")
+                    time.sleep(wait)
+
+                start = time.perf_counter()
+                try:
+                    with metrics.outbound(self.name, operation):
+                        result = fn()
+                except Exception as exc:
+                    delay = self._after_failure(exc, attempt, give_up)
+                else:
+                    self._record(True, time.perf_counter() - start)
+                    return result
+            finally:
+                if probe:
+                    self._end_probe()
+            time.sleep(delay)
+
+    def snapshot(self) -> dict:
+        return {
+            "state": self.state,
+            "limit": round(self.limit, 2),
+            "in_flight": self.in_flight,
+            "tokens": round(self.tokens, 2),
+            "consecutive_failures": self.failures,
+            **self.stats,
+        }
+
+
+def _env(name: str, default: float) -> float:
+    return float(os.getenv(name, default))
+
+
+# ✅ One governor per upstream, shared by every caller in the process
+SERPER = Governor(
+    "serper",
+    rate=_env("SERPER_RPS", 5), burst=int(_env("SERPER_BURST", 10)),
+    max_concurrency=int(_env("SERPER_MAX_CONCURRENCY", 8)),
+    target_latency=_env("SERPER_TARGET_LATENCY", 2), timeout=_env("SERPER_TIMEOUT", 8),
+    deadline=_env("SERPER_DEADLINE", 15),
+)
+OPENAI = Governor(
+    "openai",
+    rate=_env("OPENAI_RPS", 20), burst=int(_env("OPENAI_BURST", 20)),
+    max_concurrency=int(_env("OPENAI_MAX_CONCURRENCY", 16)),
+    target_latency=_env("OPENAI_TARGET_LATENCY", 8), timeout=_env("OPENAI_TIMEOUT", 30),
+    deadline=_env("OPENAI_DEADLINE", 45),
+)
+SLACK = Governor(
+    "slack",   # incoming webhooks allow about one message per second
+    rate=_env("SLACK_RPS", 1), burst=int(_env("SLACK_BURST", 3)),
+    max_concurrency=1, target_latency=_env("SLACK_TARGET_LATENCY", 2), timeout=_env("SLACK_TIMEOUT", 10),
+    deadline=_env("SLACK_DEADLINE", 60), retries=int(_env("SLACK_RETRIES", 4)), backoff_cap=30.0,
+)
+GOVERNORS = [SERPER, OPENAI, SLACK]
+
+metrics.Gauge("scout_upstream_concurrency_limit", "Current adaptive concurrency limit per upstream.", ("service",),
+              collect=lambda: [((g.name,), round(g.limit, 2)) for g in GOVERNORS])
+metrics.Gauge("scout_upstream_in_flight", "Calls in flight per upstream.", ("service",),
+              collect=lambda: [((g.name,), g.in_flight) for g in GOVERNORS])
+metrics.Gauge("scout_upstream_circuit_open", "1 while the upstream's circuit breaker is open.", ("service",),
+              collect=lambda: [((g.name,), int(g.state == "open")) for g in GOVERNORS])
+metrics.Gauge("scout_upstream_calls_total", "Governed calls by result.", ("service", "result"), kind="counter",
+              collect=lambda: [((g.name, k), v) for g in GOVERNORS for k, v in g.stats.items()])
@@ -3,14 +3,28 @@ import json
 import asyncio
 import httpx
 import re
+import time
+from contextlib import aclosing
 from datetime import datetime, timedelta, timezone
-from typing import List
+from typing import Dict
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Request, Query
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse, PlainTextResponse
 from dotenv import load_dotenv
-from openai import OpenAI
-from db import init_db, insert_article, get_cached_articles
+from openai import AsyncOpenAI
+from db import (
+    init_db, close_db, insert_articles_bulk, get_cached_articles, query_articles,
+    mark_refreshed, get_last_refresh, add_insert_listener, search_articles, decode_search_cursor,
+    get_passages_after,
+)
+from retrieval import RetrievalIndex
+from response_cache import ResponseCache
+from ws_hub import WebSocketHub, SeenItems, DEFAULT_TOPICS
+from cluster import LiveRelay
+from ai_enrichment.summary_service import SummaryService
+import metrics
+from metrics import log_event
+from governor import SERPER, OPENAI, CircuitOpen
 
 # ======================================
 # 🔧 CONFIG
@@ -18,6 +32,13 @@ from db import init_db, insert_article, get_cached_articles
 load_dotenv()
 OPENAI_KEY = os.getenv("OPENAI_API_KEY", "")
 SERPER_KEY = os.getenv("SERPER_API_KEY")  # ✅ Serper API Key
+SERPER_URL = os.getenv("SERPER_URL", "https://google.serper.dev/news")
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL") or None   # None = api.openai.com
+FRESHNESS_SECONDS = int(os.getenv("FRESHNESS_SECONDS", "1800"))  # product data older than this is stale
+EMPTY_REFRESH_RETRY_SECONDS = min(FRESHNESS_SECONDS, int(os.getenv("EMPTY_REFRESH_RETRY_SECONDS", "300")))  # after an empty/failed fetch
+STALE_WHILE_REVALIDATE = os.getenv("STALE_WHILE_REVALIDATE", "1") == "1"
+LIVE_POLL_SECONDS = int(os.getenv("LIVE_POLL_SECONDS", "600"))   # per subscribed topic
+LIVE_TOPIC_CHECK_SECONDS = float(os.getenv("LIVE_TOPIC_CHECK_SECONDS", "2"))   # leader re-reads every worker's topics
 
 app = FastAPI(title="HAYCARB Market Scout API")
 
@@ -30,32 +51,52 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Request-ID"],
 )
 
 
-connections: List[WebSocket] = []
-client = OpenAI(api_key=OPENAI_KEY)
+hub = WebSocketHub()   # ✅ per-client queues + sender tasks
+relay = LiveRelay(hub)   # ✅ one leader polls, every worker fans out
+refreshing: Dict[str, asyncio.Task] = {}   # ✅ in-flight refresh per product
+response_cache = ResponseCache()            # ✅ hot read responses, dropped per product on insert
+retriever = RetrievalIndex()                # ✅ local top-k passages for /chat context
+add_insert_listener(lambda kind, product, articles: [   # ✅ collapsed stories are listed under every product
+    response_cache.invalidate_product(p) for p in {product, *(p for a in articles for p in a.get("products") or ())}
+])
+add_insert_listener(lambda kind, product, articles: [retriever.add(kind, {**a, "product": product}) for a in articles])
+client = AsyncOpenAI(api_key=OPENAI_KEY, base_url=OPENAI_BASE_URL, max_retries=0)   # ✅ retries: governor.OPENAI
+summarizer = SummaryService(OPENAI_KEY, base_url=OPENAI_BASE_URL)   # ✅ async, cached, concurrency-limited
 
 
 # ======================================
-# 🧠 AI SUMMARIZATION
+# 📈 METRICS (scraped from /metrics)
 # ======================================
-async def ai_summarize(text: str) -> str:
-    if not text:
-        return "No summary available."
+app.add_middleware(metrics.RequestMetrics)   # ✅ request id + per-route latency + JSON access log
 
-    try:
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[{"role": "user", "content": f"Summarize in 25 words:\n{text}"}],
-        )
-        return response.choices[0].message.content.strip()
 
-    except Exception as e:
-        print("⚠️ Summarization skipped:", e)
-        return text[:150] + "..."   # ✅ return raw text, don't crash
+def ws_queue_depths():
+    depths = [c.queue.qsize() for c in hub.clients]
+    return [(("max",), max(depths, default=0)), (("total",), sum(depths))]
 
 
+metrics.Gauge("scout_response_cache_hit_ratio", "Response cache hits / lookups.",
+              collect=lambda: [((), response_cache.stats()["hit_ratio"])])
+metrics.Gauge("scout_response_cache_lookups_total", "Response cache lookups.", ("result",), kind="counter",
+              collect=lambda: [(("hit",), response_cache.hits), (("miss",), response_cache.misses)])
+metrics.Gauge("scout_ws_clients", "Connected /ws/updates clients.", collect=lambda: [((), len(hub.clients))])
+metrics.Gauge("scout_ws_queue_depth", "Messages waiting in WebSocket client queues.", ("stat",),
+              collect=ws_queue_depths)
+metrics.Gauge("scout_ws_broadcasts_total", "Live updates broadcast.", kind="counter",
+              collect=lambda: [((), hub.broadcasts)])
+metrics.Gauge("scout_ws_dropped_messages_total", "Messages dropped for slow WebSocket clients.", kind="counter",
+              collect=lambda: [((), hub.dropped)])
+metrics.Gauge("scout_live_leader", "1 on the worker running the live broadcaster.",
+              collect=lambda: [((), int(relay.is_leader))])
+metrics.Gauge("scout_live_relayed_total", "Live updates fanned out from other workers' outbox rows.", kind="counter",
+              collect=lambda: [((), relay.relayed)])
+metrics.Gauge("scout_refreshes_in_flight", "Product refreshes currently running.",
+              collect=lambda: [((), len(refreshing))])
+
 
 # ======================================
 # 🌍 FETCH NEWS (Serper.dev → Google News API)
@@ -66,21 +107,29 @@ async def ai_summarize(text: str) -> str:
 # ======================================
 
 async def fetch_news(product: str, limit: int = 8):
+    """Latest Serper news for `product`; None when the call failed or the breaker is open."""
     if not SERPER_KEY:
         print("❌ SERPER_API_KEY missing in `.env`, configure it!")
         return []
 
-    url = "https://google.serper.dev/news"
+    url = SERPER_URL
     headers = {"X-API-KEY": SERPER_KEY}
     payload = {"q": product, "num": limit}
 
     async with httpx.AsyncClient() as http:
-        try:
+        async def post():
             res = await http.post(url, json=payload, headers=headers, timeout=15)
             res.raise_for_status()
+            return res
+
+        try:
+            res = await SERPER.call(post, "fetch_news")   # ✅ rate limit, retries, circuit breaker
+        except CircuitOpen as e:
+            print(f"⏸️ {e}, serving cached {product} data")
+            return None
         except Exception as e:
             print("❌ Serper Fetch Error:", e)
-            return []
+            return None
 
         data = res.json().get("news", [])
 
@@ -126,6 +175,58 @@ async def fetch_news(product: str, limit: int = 8):
     return news_list
 
 
+# ======================================
+# ♻️ PRODUCT REFRESH (single-flight + stale-while-revalidate)
+# ======================================
+async def _refresh(product: str):
+    start = time.perf_counter()
+    news = await fetch_news(product, limit=10) or []
+
+    summaries = await summarizer.summarize_many([n.get("summary") or n["title"] for n in news])
+    for n, summary in zip(news, summaries):
+        n["summary"] = summary
+    await insert_articles_bulk(product, news)   # ✅ one transaction for the whole fetch
+
+    # ✅ Always record the attempt: an empty fetch (no key, upstream down, breaker
+    # open, no news) is retried after EMPTY_REFRESH_RETRY_SECONDS, not on every request
+    await mark_refreshed(product, age_seconds=0 if news else FRESHNESS_SECONDS - EMPTY_REFRESH_RETRY_SECONDS)
+    print(f"💾 Cached {len(news)} new articles for {product}")
+    log_event("refresh", product=product, articles=len(news), duration_ms=round((time.perf_counter() - start) * 1000, 2))
+    return news
+
+
+def start_refresh(product: str) -> asyncio.Task:
+    """Start a refresh of `product`, or join the one already in flight."""
+    task = refreshing.get(product)
+    if task is None:
+        task = asyncio.create_task(_refresh(product))
+        refreshing[product] = task
+        task.add_done_callback(lambda t: _refresh_done(product, t))
+    return task
+
+
+def _refresh_done(product: str, task: asyncio.Task):
+    refreshing.pop(product, None)
+    if not task.cancelled() and task.exception():
+        print(f"⚠️ Refresh failed for {product}:", task.exception())
+
+
+async def refresh_product(product: str):
+    # shield: one cancelled request must not cancel the fetch other requests wait on
+    return await asyncio.shield(start_refresh(product))
+
+
+async def is_stale(product: str) -> bool:
+    refreshed_at = await get_last_refresh(product)
+    return refreshed_at is None or datetime.now(timezone.utc).timestamp() - refreshed_at > FRESHNESS_SECONDS
+
+
+def period_cutoff(period: str) -> datetime:
+    now = datetime.now(timezone.utc)  # ✅ timezone-aware datetime
+    days_map = {"day": 1, "month": 30, "year": 365}
+    return now - timedelta(days=days_map.get(period, 9999))
+
+
 # ======================================
 # 📦 OPPORTUNITIES ENDPOINT (pagination + sorting + timezone FIX)
 # ======================================
@@ -135,133 +236,358 @@ async def get_opportunities(
     product: str,
     period: str = "all",
     skip: int = Query(0, ge=0),
-    limit: int = Query(8, ge=1, le=50)
+    limit: int = Query(8, ge=1, le=50),
+    cursor: str = None,
 ):
 
-    now = datetime.now(timezone.utc)  # ✅ timezone-aware datetime
-    days_map = {"day": 1, "month": 30, "year": 365}
-    cutoff = now - timedelta(days=days_map.get(period, 9999))
-
-    cached = await get_cached_articles(product)
+    cutoff = period_cutoff(period)
 
     sort_order = request.query_params.get("order", "desc")  # asc = oldest first
 
-    sorted_cached = sorted(
-        cached,
-        key=lambda x: x.get("date", ""),
-        reverse=(sort_order == "desc"),
-    )
+    # ✅ Repeated dashboard polls are answered from memory
+    cache_key = ("opportunities", product, period, sort_order, skip, limit, cursor)
+    cached = response_cache.get(cache_key)
+    if cached:
+        body, headers = cached
+        return Response(content=body, media_type="application/json", headers=headers)
 
-    filtered = []
-    for a in sorted_cached:
+    # ✅ Keyset cursor "<published_epoch>:<id>" from the previous page's X-Next-Cursor
+    after = None
+    if cursor:
         try:
-            raw_date = a.get("date", "").replace("Z", "+00:00")
-            pub_date = datetime.fromisoformat(raw_date)
+            epoch, row_id = cursor.split(":")
+            after = (int(epoch), int(row_id))
+        except ValueError:
+            return JSONResponse({"error": "Invalid cursor"}, status_code=400)
+
+    # ✅ Period filter, ordering and pagination all run in SQL on the article_products (product, published_epoch) index
+    paginated, next_cursor = await query_articles(
+        product, int(cutoff.timestamp()), sort_order, skip, limit, after
+    )
+    headers = {"X-Next-Cursor": f"{next_cursor[0]}:{next_cursor[1]}"} if next_cursor else {}
 
-            if pub_date >= cutoff:
-                filtered.append(a)
+    if paginated:
+        # ✅ Serve cached rows now, revalidate in the background
+        if STALE_WHILE_REVALIDATE and product not in refreshing and await is_stale(product):
+            start_refresh(product)
+            print(f"🔄 Background refresh started for {product}")
 
-        except Exception as e:
-            print("⚠️ Date parsing issue:", e)
+        print(f"🗃️ Returned {len(paginated)} cached | skip={skip}, order={sort_order}")
+        response = JSONResponse(content=paginated, headers=headers)
+        response_cache.set(cache_key, product, (response.body, headers))
+        return response
 
-    paginated = filtered[skip: skip + limit]
+    # ✅ Past the last cached page: nothing more to return
+    if skip or after:
+        return JSONResponse(content=[])
 
-    if paginated:
-        print(f"🗃️ Returned {len(paginated)} cached | skip={skip}, order={sort_order}")
-        return JSONResponse(content=paginated)
+    # ✅ Fetch new fresh updates (concurrent misses share one fetch)
+    news = await refresh_product(product)
+    return JSONResponse(content=news)
 
-    # ✅ Fetch new fresh updates
-    news = await fetch_news(product, limit=10)
 
-    for n in news:
-        n["summary"] = await ai_summarize(n.get("summary") or n["title"])
-        await insert_article(product, n)
+# ======================================
+# 🔎 SEARCH ENDPOINT (FTS5 + BM25 over news cache & opportunities)
+# ======================================
+@app.get("/search")
+async def search(
+    q: str = Query(..., min_length=1),
+    product: str = None,
+    period: str = "all",
+    limit: int = Query(20, ge=1, le=50),
+    cursor: str = None,
+):
+    after = None
+    if cursor:
+        try:
+            after = decode_search_cursor(cursor)
+        except Exception:
+            return JSONResponse({"error": "Invalid cursor"}, status_code=400)
 
-    print(f"💾 Cached {len(news)} new articles for {product}")
-    return JSONResponse(content=news)
+    since = int(period_cutoff(period).timestamp()) if period in ("day", "month", "year") else None
+    results, next_cursor = await search_articles(q, product, since, limit, after)
+    return {"results": results, "next_cursor": next_cursor}
 
 
 # ======================================
 # 💬 AI CHAT ENDPOINT (Assistant remains unchanged)
 # ======================================
-@app.post("/chat")
-async def chat_endpoint(request: Request):
-    body = await request.json()
-    user_message = body.get("message", "").strip()
-    product = body.get("product", "General")
+async def sync_retriever():
+    """Index rows written since the last sync (incl. run_daily.py opportunities)."""
+    for row_id, kind, doc in await get_passages_after(retriever.last_id):
+        retriever.add(kind, doc)
+        retriever.last_id = row_id
+    retriever.mark_synced()
 
-    if not user_message:
-        return JSONResponse({"response": "Please enter a question."}, status_code=400)
 
-    cached_articles = await get_cached_articles(product)
-    context = "\n".join([f"- {a['title']} ({a['summary']})" for a in cached_articles[:5]])
+async def chat_context(product: str, question: str, k: int = 5) -> list:
+    if retriever.needs_sync():
+        await sync_retriever()
+
+    passages = retriever.search(question, k=k, product=product)
+    if passages:
+        return passages
+
+    # ✅ Nothing relevant indexed → fall back to the latest product updates
+    cached_articles = response_cache.get(("chat", product))
+    if cached_articles is None:
+        cached_articles = await get_cached_articles(product)
+        response_cache.set(("chat", product), product, cached_articles)
+    return cached_articles[:k]
+
+
+def chat_messages(product: str, user_message: str, passages: list) -> list:
+    context = "\n".join([f"- {a['title']} ({a['summary']})" for a in passages])
 
     prompt = f"""
 You are Haycarb's AI Market Intelligence Assistant.
 User is asking about: **{product}**
 
-Latest related updates:
+Most relevant updates:
 {context}
 
 Respond concisely and insightfully.
 User question:
 {user_message}
 """
+    return [
+        {"role": "system", "content": "You are an expert market insights assistant."},
+        {"role": "user", "content": prompt},
+    ]
+
+
+def cached_answer(passages: list) -> str:
+    """Reply while OpenAI's circuit is open: the stored updates the answer would have used."""
+    if not passages:
+        return "The AI assistant is temporarily unavailable. Please try again in a minute."
+    updates = "\n".join(f"- {a['title']}: {a['summary']}" for a in passages)
+    return f"The AI assistant is temporarily unavailable. The most relevant recent updates are:\n{updates}"
+
+
+async def stream_chat(messages: list):
+    """Yield answer tokens as OpenAI produces them; closing the generator aborts the upstream call."""
+    stream = await OPENAI.call(   # governed until the response starts streaming
+        lambda: client.chat.completions.create(model="gpt-4o-mini", messages=messages, stream=True),
+        "chat_stream",
+    )
+    try:
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+    finally:
+        await stream.close()
+
+
+def sse(data: dict, event: str = None) -> str:
+    head = f"event: {event}\n" if event else ""
+    return f"{head}data: {json.dumps(data)}\n\n"
+
+
+@app.post("/chat")
+async def chat_endpoint(request: Request):
+    body = await request.json()
+    user_message = body.get("message", "").strip()
+    product = body.get("product", "General")
+
+    if not user_message:
+        return JSONResponse({"response": "Please enter a question."}, status_code=400)
+
+    passages = await chat_context(product, user_message)
+    messages = chat_messages(product, user_message, passages)
+
+    # ✅ Streaming mode: {"stream": true}, ?stream=1 or Accept: text/event-stream
+    wants_stream = (
+        body.get("stream") is True
+        or request.query_params.get("stream") in ("1", "true")
+        or "text/event-stream" in request.headers.get("accept", "")
+    )
+    if wants_stream:
+        async def events():
+            try:
+                # ✅ aclosing: a disconnect closes the upstream stream now, not at GC
+                async with aclosing(stream_chat(messages)) as tokens:
+                    async for token in tokens:
+                        if await request.is_disconnected():
+                            print("🔌 Chat client disconnected, stream cancelled")
+                            return
+                        yield sse({"token": token})
+                yield sse({}, event="done")
+            except CircuitOpen:
+                yield sse({"token": cached_answer(passages), "degraded": True})
+                yield sse({}, event="done")
+            except Exception as e:
+                print("⚠️ AI chat stream error:", e)
+                yield sse({"response": "Something went wrong. Try again."}, event="error")
+
+        return StreamingResponse(
+            events(),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
 
     try:
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": "You are an expert market insights assistant."},
-                {"role": "user", "content": prompt},
-            ]
+        response = await OPENAI.call(
+            lambda: client.chat.completions.create(model="gpt-4o-mini", messages=messages), "chat"
         )
         return {"response": response.choices[0].message.content.strip()}
 
+    except CircuitOpen:
+        return {"response": cached_answer(passages), "degraded": True}   # ✅ no wait on a dead upstream
     except Exception as e:
         print("⚠️ AI chat error:", e)
         return {"response": "Something went wrong. Try again."}
 
 
+@app.websocket("/ws/chat")
+async def chat_websocket(ws: WebSocket):
+    """
+    Send {"message": ..., "product": ...}; receive {"type": "token"} frames then
+    {"type": "done"}. A new question cancels the answer in progress.
+    """
+    await ws.accept()
+    current = None
+
+    async def answer(product: str, user_message: str):
+        passages = await chat_context(product, user_message)
+        try:
+            async with aclosing(stream_chat(chat_messages(product, user_message, passages))) as tokens:
+                async for token in tokens:
+                    await ws.send_json({"type": "token", "text": token})
+            await ws.send_json({"type": "done"})
+        except asyncio.CancelledError:
+            raise
+        except CircuitOpen:
+            await ws.send_json({"type": "token", "text": cached_answer(passages), "degraded": True})
+            await ws.send_json({"type": "done"})
+        except Exception as e:
+            print("⚠️ AI chat stream error:", e)
+            await ws.send_json({"type": "error", "response": "Something went wrong. Try again."})
+
+    try:
+        while True:
+            try:
+                body = json.loads(await ws.receive_text())
+            except ValueError:
+                body = {}
+            if not isinstance(body, dict):
+                body = {}
+            user_message = str(body.get("message", "")).strip()
+            if not user_message:
+                await ws.send_json({"type": "error", "response": "Please enter a question."})
+                continue
+            if current and not current.done():
+                current.cancel()
+            current = asyncio.create_task(answer(body.get("product", "General"), user_message))
+    except WebSocketDisconnect:
+        pass
+    finally:
+        if current and not current.done():
+            current.cancel()   # ✅ stops the upstream completion too
+
+
 # ======================================
 # 🔌 WEBSOCKET — Live Push Notifications
 # ======================================
 @app.websocket("/ws/updates")
 async def websocket_endpoint(ws: WebSocket):
-    await ws.accept()
-    connections.append(ws)
+    # ✅ ?topics=PFAS,Mining overrides the default topics ("?topics=" → none until subscribe)
+    raw_topics = ws.query_params.get("topics")
+    topics = DEFAULT_TOPICS if raw_topics is None else [t.strip() for t in raw_topics.split(",") if t.strip()]
+
+    # ✅ ?since=<seq> replays what a reconnecting client missed; ?encoding=zlib for compact binary frames
+    try:
+        since = int(ws.query_params["since"]) if "since" in ws.query_params else None
+    except ValueError:
+        since = None
+    encoding = ws.query_params.get("encoding", "json")
+
+    client = await hub.connect(ws, topics, since=since, encoding=encoding)
     print("🟢 WS client connected")
 
     try:
         while True:
-            await ws.receive_text()  # ✅ Fix: keeps connection alive
+            handle_ws_message(client, await ws.receive_text())
     except WebSocketDisconnect:
         print("🔴 WS client disconnected")
-        connections.remove(ws)
+    finally:
+        await hub.disconnect(client)
 
 
+def handle_ws_message(client, text: str):
+    """{"action": "subscribe" | "unsubscribe", "topics": [...]}; anything else is a keep-alive."""
+    try:
+        msg = json.loads(text)
+    except ValueError:
+        return
+    if not isinstance(msg, dict):
+        return
+
+    action = msg.get("action")
+    topics = msg.get("topics") or []
+    if isinstance(topics, str):
+        topics = [topics]
+    topics = [str(t).strip() for t in topics if str(t).strip()]
+
+    if action == "subscribe":
+        hub.subscribe(client, topics)
+    elif action == "unsubscribe":
+        hub.unsubscribe(client, topics)
+    else:
+        return
+    hub.send(client, {"type": "subscriptions", "topics": sorted(client.topics)})
+
+
+@app.get("/ws/stats")
+def ws_stats():
+    return {**hub.stats(), "cluster": relay.stats()}
+
 
 # ======================================
 # 🔁 BACKGROUND BROADCASTER
 # ======================================
 async def broadcast_live_news():
-    topics = ["PFAS", "Activated Carbon", "Gold Recovery", "Water Treatment"]
+    """
+    Poll only topics someone (on any worker) subscribed to; push only items not
+    sent before. Runs on the leader worker only (see cluster.LiveRelay).
+    """
+    seen = SeenItems()
+    for _, topic, text in hub.history:   # ✅ a new leader doesn't resend what the last one pushed
+        if topic is not None:
+            item = json.loads(text)
+            seen.add(topic, item.get("link") or item.get("title"))
+    last_polled = {}   # topic -> loop time of last Serper call
     update_id = 1
+    loop = asyncio.get_running_loop()
 
     while True:
-        for topic in topics:
-            news = await fetch_news(topic, limit=1)
-            if news:
-                for ws in connections[:]:
-                    try:
-                        await ws.send_text(json.dumps(news[0]))
-                    except:
-                        connections.remove(ws)
-
-                print(f"📡 Live Update #{update_id} sent → {topic}")
+        now = loop.time()
+        due = [
+            t for t in await relay.wanted_topics()
+            if t not in last_polled or now - last_polled[t] >= LIVE_POLL_SECONDS
+        ]
+        hub.topics_added.clear()
+
+        for topic in due:
+            if not SERPER.available():
+                break   # ✅ upstream down: keep topics due, poll again once the breaker lets a probe through
+            news = await fetch_news(topic, limit=5)
+            if news is None:
+                continue   # ✅ failed: still due on the next tick (the breaker bounds how often)
+            last_polled[topic] = now
+            fresh = [n for n in news if seen.add(topic, n.get("link") or n["title"])]
+
+            for item in reversed(fresh):   # oldest first
+                receivers = await relay.publish({**item, "topic": topic}, topic=topic)
+
+                print(f"📡 Live Update #{update_id} queued for {receivers} clients → {topic}")
                 update_id += 1
 
-        await asyncio.sleep(600)  # every 10 minutes
+        # ✅ Wake early when a client here subscribes to a topic nobody was polling;
+        # other workers' new topics are picked up on the next short tick
+        try:
+            await asyncio.wait_for(hub.topics_added.wait(), timeout=min(LIVE_TOPIC_CHECK_SECONDS, LIVE_POLL_SECONDS))
+        except asyncio.TimeoutError:
+            pass
 
 
 # ======================================
@@ -270,10 +596,32 @@ async def broadcast_live_news():
 @app.on_event("startup")
 async def on_startup():
     await init_db()
-    asyncio.create_task(broadcast_live_news())
+    await sync_retriever()
+    print(f"🔎 Retrieval index ready ({len(retriever)} passages)")
+    await relay.start(broadcast_live_news)
     print("🚀 News service + AI Assistant started")
 
 
+@app.on_event("shutdown")
+async def on_shutdown():
+    await relay.stop()
+    await close_db()
+    print("🛑 DB connections closed")
+
+
+@app.get("/cache/stats")
+def cache_stats():
+    return response_cache.stats()
+
+
+@app.get("/metrics")
+def metrics_endpoint():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
 @app.get("/health")
 def health_check():
-    return {"healthy": True, "AI": bool(OPENAI_KEY), "News": bool(SERPER_KEY)}
+    return {
+        "healthy": True, "AI": bool(OPENAI_KEY), "News": bool(SERPER_KEY),
+        "upstreams": {g.name: g.snapshot() for g in (SERPER, OPENAI)},
+    }
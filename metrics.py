@@ -0,0 +1,233 @@
+# metrics.py
+import os
+import sys
+import json
+import time
+import uuid
+import logging
+import threading
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+# ✅ Latency buckets (seconds) shared by every histogram: 1 ms … 30 s
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_registry = []
+_lock = threading.Lock()   # enrichment threads (run_daily.py) record too
+
+# ✅ Per-request context: id for the log lines + time spent per dependency
+request_id: ContextVar = ContextVar("request_id", default=None)
+request_timings: ContextVar = ContextVar("request_timings", default=None)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names, values) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values)) + "}"
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labelnames=()):
+        self.name, self.help, self.labelnames = name, help, tuple(labelnames)
+        self._values = {}
+        _registry.append(self)
+
+    def inc(self, *labels, amount: float = 1):
+        with _lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self):
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} counter"
+        for labels, value in sorted(self._values.items()):
+            yield f"{self.name}{_labels(self.labelnames, labels)} {value}"
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, labelnames=(), buckets=BUCKETS):
+        self.name, self.help, self.labelnames = name, help, tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._series = {}   # labels -> [per-bucket counts (+Inf last), sum, count]
+        _registry.append(self)
+
+    def observe(self, seconds: float, *labels):
+        with _lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][bisect_left(self.buckets, seconds)] += 1
+            series[1] += seconds
+            series[2] += 1
+
+    def render(self):
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} histogram"
+        names = self.labelnames + ("le",)
+        for labels, (counts, total, count) in sorted(self._series.items()):
+            cumulative = 0
+            for bound, n in zip(self.buckets + ("+Inf",), counts):
+                cumulative += n
+                yield f"{self.name}_bucket{_labels(names, labels + (bound,))} {cumulative}"
+            yield f"{self.name}_sum{_labels(self.labelnames, labels)} {total:.6f}"
+            yield f"{self.name}_count{_labels(self.labelnames, labels)} {count}"
+
+
+class Gauge:
+    """Read at scrape time from `collect()` → [(label values tuple, value)]; costs nothing in between."""
+
+    def __init__(self, name: str, help: str, labelnames=(), collect=None, kind: str = "gauge"):
+        self.name, self.help, self.labelnames = name, help, tuple(labelnames)
+        self.collect = collect
+        self.kind = kind   # "counter" for running totals kept elsewhere
+        _registry.append(self)
+
+    def render(self):
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} {self.kind}"
+        for labels, value in self.collect() if self.collect else ():
+            yield f"{self.name}{_labels(self.labelnames, labels)} {value}"
+
+
+def render() -> str:
+    """Every registered metric in the Prometheus text exposition format."""
+    lines = []
+    for metric in _registry:
+        try:
+            lines.extend(metric.render())
+        except Exception as e:   # one broken collector must not hide the rest
+            lines.append(f"# {metric.name} unavailable: {e}")
+    return "\n".join(lines) + "\n"
+
+
+# ======================================
+# 📏 HOT-PATH METRICS
+# ======================================
+OUTBOUND_SECONDS = Histogram(
+    "scout_outbound_request_seconds", "Latency of calls to external services.",
+    ("service", "operation", "outcome"),
+)
+OUTBOUND_ERRORS = Counter(
+    "scout_outbound_errors_total", "Failed calls to external services.", ("service", "operation"),
+)
+DB_SECONDS = Histogram(
+    "scout_db_seconds", "SQLite time per db.py call, including the wait for a pooled connection.",
+    ("kind", "query"),
+)
+HTTP_SECONDS = Histogram(
+    "scout_http_request_seconds", "API request latency.", ("method", "route", "status"),
+)
+FEED_FETCHES = Counter(
+    "scout_feed_fetches_total", "Feed fetches by result (fetched, not_modified, unchanged, failed).", ("result",),
+)
+FEED_PARSES = Counter(
+    "scout_feed_parses_total", "Feeds parsed by path (fast = lxml stream, fallback = feedparser).", ("path",),
+)
+
+
+def _account(key: str, seconds: float):
+    timings = request_timings.get()
+    if timings is not None:
+        timings[key] = timings.get(key, 0.0) + seconds
+
+
+@contextmanager
+def outbound(service: str, operation: str):
+    """Time one external call; exceptions are counted as errors and re-raised."""
+    start = time.perf_counter()
+    outcome = "ok"
+    try:
+        yield
+    except BaseException:
+        outcome = "error"
+        OUTBOUND_ERRORS.inc(service, operation)
+        raise
+    finally:
+        seconds = time.perf_counter() - start
+        OUTBOUND_SECONDS.observe(seconds, service, operation, outcome)
+        _account(service, seconds)
+
+
+def timed_db(kind: str):
+    """Decorator for db.py coroutines: records DB_SECONDS under the function name."""
+    def decorate(fn):
+        name = fn.__name__
+
+        @wraps(fn)
+        async def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return await fn(*args, **kwargs)
+            finally:
+                seconds = time.perf_counter() - start
+                DB_SECONDS.observe(seconds, kind, name)
+                _account("db", seconds)
+        return wrapper
+    return decorate
+
+
+# ======================================
+# 🧾 STRUCTURED LOGS
+# ======================================
+logger = logging.getLogger("scout")
+if not logger.handlers:
+    _handler = logging.StreamHandler(sys.stdout)
+    _handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(_handler)
+    logger.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
+    logger.propagate = False
+
+
+def new_request_id() -> str:
+    return uuid.uuid4().hex[:16]
+
+
+def log_event(event: str, **fields):
+    """One JSON line, tagged with the current request id."""
+    if logger.isEnabledFor(logging.INFO):
+        record = {"ts": round(time.time(), 3), "event": event, "request_id": request_id.get(), **fields}
+        logger.info(json.dumps(record, default=str))
+
+
+class RequestMetrics:
+    """
+    ASGI middleware: gives every HTTP request an id (X-Request-ID, taken from
+    the client when sent), records HTTP_SECONDS per route and logs one line
+    with the time spent in each dependency (db, serper, openai, ...).
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        rid = dict(scope["headers"]).get(b"x-request-id", b"").decode("latin-1")[:64] or new_request_id()
+        rid_token, timings_token = request_id.set(rid), request_timings.set({})
+        status = 500
+        start = time.perf_counter()
+
+        async def send_with_id(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message["headers"] = list(message.get("headers", [])) + [(b"x-request-id", rid.encode("latin-1"))]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            seconds = time.perf_counter() - start
+            route = getattr(scope.get("route"), "path", "unmatched")   # template, keeps label count bounded
+            HTTP_SECONDS.observe(seconds, scope["method"], route, status)
+            breakdown = {f"{k}_ms": round(v * 1000, 2) for k, v in request_timings.get().items()}
+            log_event("request", method=scope["method"], path=scope["path"], status=status,
+                      duration_ms=round(seconds * 1000, 2), **breakdown)
+            request_id.reset(rid_token)
+            request_timings.reset(timings_token)
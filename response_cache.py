@@ -0,0 +1,77 @@
+# response_cache.py
+import os
+import time
+from collections import OrderedDict, defaultdict
+
+CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "1024"))   # max cached responses
+CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", "60"))     # seconds
+
+
+class ResponseCache:
+    """
+    Bounded in-process cache for read endpoints: LRU eviction by entry count,
+    a TTL per entry, and per-product invalidation when new rows are written.
+    """
+
+    def __init__(self, max_entries: int = CACHE_SIZE, ttl: float = CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()           # key -> (expires_at, product, value)
+        self._by_product = defaultdict(set)     # product -> keys
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, product, value = entry
+        if expires_at < time.monotonic():
+            self._drop(key)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key, product, value):
+        if key in self._entries:
+            self._drop(key)
+        self._entries[key] = (time.monotonic() + self.ttl, product, value)
+        self._by_product[product].add(key)
+
+        while len(self._entries) > self.max_entries:
+            oldest = next(iter(self._entries))
+            self._drop(oldest)
+            self.evictions += 1
+
+    def invalidate_product(self, product):
+        keys = self._by_product.pop(product, set())
+        for key in keys:
+            self._entries.pop(key, None)
+        if keys:
+            self.invalidations += 1
+
+    def _drop(self, key):
+        _, product, _ = self._entries.pop(key)
+        keys = self._by_product.get(product)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_product[product]
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
@@ -0,0 +1,118 @@
+# retrieval.py
+import re
+import math
+import time
+import numpy as np
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+STOPWORDS = {
+    "a", "an", "the", "of", "and", "or", "to", "in", "on", "for", "with", "at", "by", "from",
+    "is", "are", "was", "be", "it", "this", "that", "what", "which", "how", "about", "any",
+    "do", "does", "me", "we", "our", "us", "i", "you", "there", "new", "latest",
+}
+K1, B = 1.2, 0.75          # BM25 term-frequency saturation / length normalization
+PRODUCT_BOOST = 1.5        # passages of the product being asked about rank higher
+SYNC_SECONDS = 60          # how often rows written by other processes are picked up
+
+
+def tokenize(text: str) -> list:
+    tokens = []
+    for t in TOKEN_RE.findall((text or "").lower()):
+        if t in STOPWORDS:
+            continue
+        if len(t) > 4 and t.endswith("s") and not t.endswith("ss"):
+            t = t[:-1]   # cheap plural folding: filters → filter
+        tokens.append(t)
+    return tokens
+
+
+class RetrievalIndex:
+    """
+    Offline sparse index (TF-IDF with BM25 weighting) over cached articles and
+    opportunities. Postings are appended on insert and turned into NumPy arrays
+    lazily, so a query costs a few vector ops per query term.
+    """
+
+    def __init__(self):
+        self.terms = {}          # term -> (doc ids list, term frequency list)
+        self._arrays = {}        # term -> (np doc ids, np tfs), rebuilt after appends
+        self.docs = []           # passage dicts, position = doc id
+        self.product_codes = []  # product (as int code) per doc id
+        self._codes = {}         # product -> int code
+        self._codes_np = None
+        self.lengths = []        # token count per doc id
+        self._lengths_np = None
+        self.keys = set()        # (kind, link/title) already indexed
+        self.last_id = 0         # highest articles.id indexed
+        self.last_sync = 0.0
+
+    def __len__(self):
+        return len(self.docs)
+
+    def add(self, kind: str, doc: dict) -> bool:
+        key = (kind, doc.get("link") or doc.get("title"))
+        if key in self.keys:
+            return False
+        tokens = tokenize(f"{doc.get('title', '')} {doc.get('title', '')} {doc.get('summary', '')}")
+        if not tokens:
+            return False
+
+        doc_id = len(self.docs)
+        self.keys.add(key)
+        self.docs.append({**doc, "kind": kind})
+        self.product_codes.append(self._codes.setdefault(doc.get("product"), len(self._codes)))
+        self.lengths.append(len(tokens))
+        self._lengths_np = self._codes_np = None
+
+        counts = {}
+        for t in tokens:
+            counts[t] = counts.get(t, 0) + 1
+        for t, tf in counts.items():
+            ids, tfs = self.terms.setdefault(t, ([], []))
+            ids.append(doc_id)
+            tfs.append(tf)
+            self._arrays.pop(t, None)
+        return True
+
+    def _postings(self, term):
+        arrays = self._arrays.get(term)
+        if arrays is None:
+            ids, tfs = self.terms[term]
+            arrays = (np.asarray(ids, dtype=np.int32), np.asarray(tfs, dtype=np.float32))
+            self._arrays[term] = arrays
+        return arrays
+
+    def search(self, query: str, k: int = 5, product: str = None) -> list:
+        """Top-k passages for `query` (empty when no query term is indexed)."""
+        n = len(self.docs)
+        terms = [t for t in set(tokenize(query)) if t in self.terms]
+        if not n or not terms:
+            return []
+
+        if self._lengths_np is None:
+            self._lengths_np = np.asarray(self.lengths, dtype=np.float32)
+            self._codes_np = np.asarray(self.product_codes, dtype=np.int32)
+        lengths = self._lengths_np
+        norm = K1 * (1 - B + B * lengths / lengths.mean())
+
+        scores = np.zeros(n, dtype=np.float32)
+        for term in terms:
+            ids, tfs = self._postings(term)
+            idf = math.log(1 + (n - len(ids) + 0.5) / (len(ids) + 0.5))
+            scores[ids] += idf * tfs * (K1 + 1) / (tfs + norm[ids])
+
+        if product in self._codes:
+            scores[self._codes_np == self._codes[product]] *= PRODUCT_BOOST
+
+        k = min(k, int(np.count_nonzero(scores)))
+        if k == 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [self.docs[i] for i in top]
+
+    def needs_sync(self) -> bool:
+        return time.monotonic() - self.last_sync >= SYNC_SECONDS
+
+    def mark_synced(self):
+        self.last_sync = time.monotonic()
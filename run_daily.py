@@ -1,55 +1,151 @@
-from scrapers.news_scraper import scrape_updates
-from ai_enrichment.summarizer import enrich_update
-from database.models import SessionLocal, Opportunity
-from alerts.slack_alert import send_slack_alert
-from datetime import datetime
+import time
+import asyncio
+import inspect
+from datetime import datetime, timezone
+import db
+from scrapers.news_scraper import scrape_updates_async
+from scrapers.near_duplicates import NearDuplicateIndex
+from scrapers.feed_cache import FeedCache
+from scrapers.checkpoints import FeedCheckpoints, published_epoch
+from scrapers import article_text
+from ai_enrichment.summarizer import enrich_updates
+from alerts.slack_alert import SlackDigestDispatcher
 
-db = SessionLocal()
 
-print("🚀 Starting run_daily.py...")
+class StageTimer:
+    """Collects wall-clock time per pipeline stage."""
 
-# Step 1: Scrape updates
-updates = scrape_updates()
-print(f"🔎 Scraper returned {len(updates)} updates")
+    def __init__(self):
+        self.timings = {}
 
-if not updates:
-    print("⚠️ No updates found. Skipping.")
-    db.close()
-    exit()
+    async def run(self, name, fn, *args):
+        start = time.perf_counter()
+        try:
+            result = fn(*args)
+            return await result if inspect.isawaitable(result) else result
+        finally:
+            self.timings[name] = time.perf_counter() - start
+
+    def report(self):
+        total = sum(self.timings.values())
+        print("⏱️ Stage timings:")
+        for name, seconds in self.timings.items():
+            print(f"   {name:<8} {seconds:8.2f}s")
+        print(f"   {'total':<8} {total:8.2f}s")
+
+
+def parse_pub_date(raw):
+    """RFC 822 (RSS) or ISO 8601 (Atom, EPA) date → aware UTC datetime (now when unparsable)."""
+    epoch = published_epoch(raw)
+    if epoch is None:
+        return datetime.now(timezone.utc)
+    return datetime.fromtimestamp(epoch, timezone.utc)
+
+
+async def filter_new(updates):
+    """Drop updates whose link is already stored (or repeated within this run)."""
+    known = await db.existing_links({u["link"] for u in updates if u.get("link")})
+    new_updates = []
+    for update in updates:
+        link = update.get("link")
+        if not link or link in known:
+            continue
+        known.add(link)
+        new_updates.append(update)
+
+    print(f"🧹 {len(updates) - len(new_updates)} duplicates skipped, {len(new_updates)} new")
+    return new_updates
+
+
+def enrich(updates):
+    summaries = enrich_updates([u.get("full_text") or u["description"] for u in updates])
+    for update, summary in zip(updates, summaries):
+        update["summary"] = summary
+    return updates
+
+
+async def insert_new(updates):
+    """Bulk insert; rows whose link appeared meanwhile are skipped by the unique constraint."""
+    if not updates:
+        return
+    rows = [
+        {
+            "title": u["title"],
+            "summary": u["summary"],
+            "source": u.get("source", "News Feed"),
+            "date": parse_pub_date(u["pub_date"]).isoformat(),
+            "link": u["link"],
+            "product": u.get("product", "PFAS"),  # ✅ dynamic product
+            "products": u.get("products") or [u.get("product", "PFAS")],
+        }
+        for u in updates
+    ]
+    inserted = await db.insert_opportunities(rows)   # ✅ one commit for the whole run
+    print(f"💾 Inserted {inserted} opportunities in one transaction.")
+
+
+def send_alerts(updates, alerts: SlackDigestDispatcher):
+    """Queue one alert per stored update; the dispatcher posts per-product digests in the background."""
+    for update in updates:
+        alerts.alert(update.get("product"), update["title"], update.get("link"))
+
+
+async def main(timer: StageTimer = None):
+    print("🚀 Starting run_daily.py...")
+    timer = timer or StageTimer()
+    await db.init_db()   # ✅ applies pending migrations
+    near_dups = NearDuplicateIndex()
+    # ✅ Feed validators and checkpoints are saved only after the insert commits,
+    # so a run that dies halfway is redone from the last committed checkpoint
+    feed_cache = FeedCache(defer=True)
+    checkpoints = FeedCheckpoints()
+    alerts = SlackDigestDispatcher()
+    alerts.start()
 
-# Step 2: Insert into DB
-for update in updates:
     try:
+        # Step 1: Scrape updates, keep entries past each feed's checkpoint
+        scraped = await timer.run("scrape", scrape_updates_async, True, feed_cache)
+        print(f"🔎 Scraper returned {len(scraped)} updates")
+        fresh = await timer.run("checkpoint", checkpoints.filter, scraped)
+
+        if not fresh:
+            print("⚠️ No updates found. Skipping.")
+            feed_cache.commit()
+            return
+
+        # Step 2: Collapse syndicated copies of one story, then skip known links
+        updates = await timer.run("collapse", near_dups.collapse, fresh)
+        new_updates = await timer.run("dedup", filter_new, updates)
+
+        # Step 3: Article bodies for the new updates (FULL_TEXT=1), parsed in a process pool
+        if article_text.ENABLED:
+            new_updates = await timer.run("extract", article_text.add_full_text, new_updates)
+
+        # Step 4: Enrich new updates in parallel token-budgeted batches
+        new_updates = await timer.run("enrich", asyncio.to_thread, enrich, new_updates)
+
+        # Step 5: Insert into DB
         try:
-            pub_date = datetime.strptime(update["pub_date"], "%a, %d %b %Y %H:%M:%S %Z")
-        except Exception:
-            pub_date = datetime.now()
-
-        # Deduplication check
-        exists = db.query(Opportunity).filter_by(link=update["link"]).first()
-        if exists:
-            print(f"⚠️ Skipping duplicate: {update['title']}")
-            continue
+            await timer.run("insert", insert_new, new_updates)
+        except Exception as e:
+            print(f"❌ Failed to insert updates: {e}")
+            return
+        near_dups.save(updates)   # ✅ only once the stories are committed
+        checkpoints.advance(fresh)   # ✅ merged and known copies included
+        checkpoints.commit()
+        feed_cache.commit()
+
+        # Step 6: Alert only after the data is committed
+        await timer.run("alert", send_alerts, new_updates, alerts)
+    finally:
+        await timer.run("alert_flush", alerts.close)   # ✅ last digests go out before exit
+        await db.close_db()
+        near_dups.close()
+        checkpoints.close()
+        feed_cache.close()
+        timer.report()
+        print("🏁 run_daily.py finished.")
+
 
-        print(f"📰 Processing: {update['title']}")
-        summary = enrich_update(update["description"])
-
-        opp = Opportunity(
-            title=update["title"],
-            summary=summary,
-            source=update.get("source", "News Feed"),
-            date=pub_date,
-            link=update["link"],
-            product=update.get("product", "PFAS")  # ✅ dynamic product
-        )
-        db.add(opp)
-        send_slack_alert(f"🚨 New Update: {update['title']}")
-        print(f"✅ Inserted: {update['title']}")
-
-    except Exception as e:
-        print(f"❌ Failed to insert {update.get('title', 'UNKNOWN')}: {e}")
-
-db.commit()
-print("💾 All changes committed to DB.")
-db.close()
-print("🏁 run_daily.py finished.")
+if __name__ == "__main__":
+    asyncio.run(main())
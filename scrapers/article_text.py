@@ -0,0 +1,156 @@
+import os
+import time
+import asyncio
+import hashlib
+import multiprocessing
+from datetime import datetime, timezone
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from scrapers.fetcher import fetch_all
+from scrapers import state_db
+from scrapers.state_db import STATE_DB
+from ai_enrichment.summarizer import trim_to_tokens
+
+try:
+    import trafilatura
+except ImportError as e:   # optional: the stage is skipped without it
+    trafilatura, _import_error = None, e
+
+# ✅ Optional stage between scraping and enrichment (FULL_TEXT=1)
+ENABLED = os.getenv("FULL_TEXT", "0") == "1"
+EXTRACT_WORKERS = int(os.getenv("EXTRACT_WORKERS", "0")) or os.cpu_count() or 1   # processes
+TEXT_TOKEN_BUDGET = int(os.getenv("FULL_TEXT_TOKENS", "600"))   # article text per update sent to the LLM
+
+# ✅ Stats of the last run (pages fetched, extracted, cache hits, throughput)
+last_run_stats = {}
+
+
+def url_hash(url: str) -> str:
+    return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+
+class ArticleTextCache:
+    """
+    Extracted article text by URL hash, next to the feed validators, so an
+    article is downloaded and parsed once however many runs list it. Pages
+    that yield no text are cached as "" too.
+    """
+
+    def __init__(self, path: str = STATE_DB):
+        self.path = path
+        self.conn = state_db.connect(path)
+
+    def get_many(self, urls) -> dict:
+        by_hash = {url_hash(u): u for u in urls}
+        found = {}
+        keys = list(by_hash)
+        for i in range(0, len(keys), 500):
+            chunk = keys[i:i + 500]
+            rows = self.conn.execute(
+                f"SELECT url_hash, text FROM article_text WHERE url_hash IN ({','.join('?' * len(chunk))})", chunk
+            ).fetchall()
+            found.update({by_hash[h]: text for h, text in rows})
+        return found
+
+    def put_many(self, texts: dict):
+        now = datetime.now(timezone.utc).isoformat()
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO article_text (url_hash, text, extracted_at) VALUES (?, ?, ?)",
+            [(url_hash(url), text, now) for url, text in texts.items()],
+        )
+        self.conn.commit()
+
+    def close(self):
+        state_db.release(self.path)
+
+
+def extract_text(html: str, url: str):
+    """Runs in a pool process: (article text or "", CPU seconds spent)."""
+    start = time.process_time()
+    try:
+        text = trafilatura.extract(html, url=url, include_comments=False, include_tables=False) or ""
+    except Exception:
+        text = ""
+    return text, time.process_time() - start
+
+
+def make_pool(workers: int = EXTRACT_WORKERS) -> ProcessPoolExecutor:
+    # spawn: forking a process that runs an event loop and threads is not safe
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+
+
+async def extract_pages(pages: dict, pool: ProcessPoolExecutor = None):
+    """
+    {url: html} → ({url: text}, stats), parsed across a process pool so the
+    event loop only waits. stats["pages_per_core_s"] is pages per CPU second
+    spent in trafilatura, i.e. what one core sustains.
+    """
+    stats = {"pages": len(pages), "extracted": 0, "wall_s": 0.0, "cpu_s": 0.0,
+             "pages_per_s": 0.0, "pages_per_core_s": 0.0}
+    if not pages:
+        return {}, stats
+
+    own_pool = pool is None
+    if own_pool:
+        pool = make_pool(min(EXTRACT_WORKERS, len(pages)))
+    loop = asyncio.get_running_loop()
+    start = time.perf_counter()
+    try:
+        results = await asyncio.gather(*(
+            loop.run_in_executor(pool, extract_text, html, url) for url, html in pages.items()
+        ))
+    finally:
+        if own_pool:
+            await asyncio.to_thread(pool.shutdown)
+
+    texts = {url: text for url, (text, _) in zip(pages, results)}
+    stats["wall_s"] = round(time.perf_counter() - start, 3)
+    stats["cpu_s"] = round(sum(seconds for _, seconds in results), 3)
+    stats["extracted"] = sum(1 for t in texts.values() if t)
+    stats["pages_per_s"] = round(len(pages) / stats["wall_s"], 1) if stats["wall_s"] else 0.0
+    stats["pages_per_core_s"] = round(len(pages) / stats["cpu_s"], 1) if stats["cpu_s"] else 0.0
+    return texts, stats
+
+
+async def add_full_text(updates, budget: int = TEXT_TOKEN_BUDGET):
+    """
+    Set update["full_text"] (the article body, trimmed to `budget` tokens) on
+    updates whose page could be downloaded and parsed; the rest keep only
+    their feed description.
+    """
+    last_run_stats.clear()
+    if trafilatura is None:
+        print(f"⚠️ trafilatura unavailable ({_import_error}), skipping full-text extraction")
+        return updates
+
+    urls = {u["link"] for u in updates if u.get("link", "").startswith("http")}
+    cache = ArticleTextCache()
+    try:
+        texts = cache.get_many(urls)
+        missing = {url: url for url in urls if url not in texts}
+        pages, fetch_stats = await fetch_all(missing, service="web", operation="fetch_article", counter=None)
+        try:
+            extracted, stats = await extract_pages(pages)
+        except BrokenProcessPool as e:
+            print(f"⚠️ Extraction pool failed: {e}")
+            extracted, stats = {}, {"pages": len(pages), "extracted": 0}
+        else:
+            cache.put_many(extracted)   # ✅ failed downloads are retried next run
+        texts.update(extracted)
+    finally:
+        cache.close()
+
+    for update in updates:
+        text = texts.get(update.get("link"))
+        if text:
+            update["full_text"] = trim_to_tokens(text, budget)
+
+    last_run_stats.update(stats, cached=len(urls) - len(missing), fetch_failed=fetch_stats["failed"])
+    print(
+        f"📄 Full text for {sum(1 for u in updates if u.get('full_text'))}/{len(updates)} updates "
+        f"({last_run_stats['cached']} cached, {stats['extracted']}/{stats['pages']} pages extracted"
+        + (f" in {stats['wall_s']:.2f}s: {stats['pages_per_s']} pages/s, "
+           f"{stats['pages_per_core_s']} pages/s per core)" if stats.get("wall_s") else ")")
+    )
+    return updates
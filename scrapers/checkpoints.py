@@ -0,0 +1,108 @@
+import os
+import json
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from scrapers import state_db
+from scrapers.state_db import STATE_DB
+
+SEEN_PER_FEED = 1000   # entry ids remembered per feed
+LOOKBACK_SECONDS = 3600 * int(os.getenv("CHECKPOINT_LOOKBACK_HOURS", "72"))   # unseen entries further behind are skipped
+
+
+def published_epoch(raw):
+    """RFC 822 (RSS) or ISO 8601 (Atom) date → UTC epoch seconds (None when unparsable)."""
+    if not raw:
+        return None
+    try:
+        parsed = parsedate_to_datetime(raw)
+    except (TypeError, ValueError):
+        try:
+            parsed = datetime.fromisoformat(raw.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return int(parsed.timestamp())
+
+
+def entry_key(update) -> str:
+    return update.get("guid") or update.get("link") or update.get("title", "")
+
+
+class FeedCheckpoints:
+    """
+    Per-feed high-watermark in the scraper state DB: the newest published time
+    seen and the ids (GUID, else link) of the last SEEN_PER_FEED entries.
+
+    filter() keeps entries past the watermark; advance() stages the new one and
+    commit() persists every staged feed in one transaction. Call commit() only
+    once the entries are stored, so a run that dies halfway is redone from the
+    last committed checkpoint.
+    """
+
+    def __init__(self, path: str = STATE_DB, lookback: int = LOOKBACK_SECONDS, keep: int = SEEN_PER_FEED):
+        self.lookback, self.keep = lookback, keep
+        self.path = path
+        self.conn = state_db.connect(path)
+        self._loaded = {}    # feed -> (newest_epoch, list of ids, oldest first)
+        self.pending = {}    # feed -> (newest_epoch, list of ids) staged by advance()
+
+    def get(self, feed: str):
+        if feed not in self._loaded:
+            row = self.conn.execute(
+                "SELECT newest_epoch, seen FROM feed_checkpoints WHERE feed = ?", (feed,)
+            ).fetchone()
+            self._loaded[feed] = (row[0], json.loads(row[1])) if row else (None, [])
+        return self.pending.get(feed) or self._loaded[feed]
+
+    def filter(self, updates) -> list:
+        """Updates not seen before and not far behind their feed's newest entry."""
+        fresh, seen_sets = [], {}
+        for update in updates:
+            feed = update.get("feed") or update.get("source", "")
+            newest, seen = self.get(feed)
+            if feed not in seen_sets:
+                seen_sets[feed] = set(seen)
+            if entry_key(update) in seen_sets[feed]:
+                continue
+            epoch = published_epoch(update.get("pub_date"))
+            if newest is not None and epoch is not None and epoch < newest - self.lookback:
+                continue
+            fresh.append(update)
+
+        skipped = len(updates) - len(fresh)
+        print(f"🔖 {skipped} entries behind their feed checkpoint, {len(fresh)} past it")
+        return fresh
+
+    def advance(self, updates):
+        """Stage the watermark moving past `updates` (persisted by commit())."""
+        by_feed = {}
+        for update in updates:
+            by_feed.setdefault(update.get("feed") or update.get("source", ""), []).append(update)
+
+        for feed, items in by_feed.items():
+            newest, seen = self.get(feed)
+            epochs = [e for e in (published_epoch(u.get("pub_date")) for u in items) if e is not None]
+            newest = max(epochs + ([newest] if newest is not None else []), default=None)
+            known = set(seen)
+            seen = seen + [k for k in dict.fromkeys(entry_key(u) for u in items) if k not in known]
+            self.pending[feed] = (newest, seen[-self.keep:])
+
+    def commit(self):
+        if not self.pending:
+            return
+        now = datetime.now(timezone.utc).isoformat()
+        with self.conn:   # ✅ every feed's checkpoint in one transaction
+            self.conn.executemany("""
+                INSERT INTO feed_checkpoints (feed, newest_epoch, seen, updated_at)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(feed) DO UPDATE SET
+                    newest_epoch = excluded.newest_epoch,
+                    seen = excluded.seen,
+                    updated_at = excluded.updated_at
+            """, [(feed, newest, json.dumps(seen), now) for feed, (newest, seen) in self.pending.items()])
+        self._loaded.update(self.pending)
+        self.pending = {}
+
+    def close(self):
+        state_db.release(self.path)
@@ -1,24 +1,45 @@
-import requests
-import feedparser
+import asyncio
+from scrapers.fetcher import fetch_all
+from scrapers.feed_cache import FeedCache
+from scrapers.feed_parser import parse_entries
+from scrapers.checkpoints import FeedCheckpoints
 
 NEWS_FEED_URL = "https://grist.org/feed/"   # 👈 switch to a real feed
 
-def scrape_updates():
+
+def scrape_updates(use_cache: bool = True, cache: FeedCache = None, checkpoints: FeedCheckpoints = None):
+    """
+    Fetch the feed; returns [] when it is unchanged since the last run.
+    With `checkpoints`, only entries past the EPA feed's watermark come back;
+    the caller advances and commits it (and a passed-in `cache`) once they
+    are stored.
+    """
+    own_cache = cache is None and use_cache
+    if own_cache:
+        cache = FeedCache()
     try:
-        headers = {"User-Agent": "Mozilla/5.0"}
-        resp = requests.get(NEWS_FEED_URL, headers=headers, timeout=10)
-        resp.raise_for_status()
-        feed = feedparser.parse(resp.text)
+        bodies, stats = asyncio.run(fetch_all({"EPA": NEWS_FEED_URL}, cache=cache))
+        if stats["not_modified"] or stats["unchanged"]:
+            print("♻️ EPA feed served from cache (unchanged)")
+        if "EPA" not in bodies:
+            return []
 
         updates = []
-        for entry in feed.entries:
+        for entry in parse_entries(bodies["EPA"]):
+            if not entry["link"]:
+                continue
             updates.append({
-                "title": entry.title,
-                "description": getattr(entry, "summary", ""),
-                "pub_date": getattr(entry, "published", ""),
-                "link": entry.link
+                "title": entry["title"],
+                "description": entry["summary"],
+                "pub_date": entry["published"],
+                "link": entry["link"],
+                "guid": entry["id"],
+                "feed": "EPA",
             })
-        return updates
+        return checkpoints.filter(updates) if checkpoints else updates
     except Exception as e:
         print(f"❌ Failed to scrape feed: {e}")
         return []
+    finally:
+        if own_cache:
+            cache.close()
@@ -0,0 +1,71 @@
+import hashlib
+from datetime import datetime, timezone
+
+from scrapers import state_db
+from scrapers.state_db import STATE_DB
+
+
+def body_hash(body: bytes) -> str:
+    return hashlib.sha256(body).hexdigest()
+
+
+class FeedCache:
+    """
+    Per-URL HTTP validators (ETag / Last-Modified) plus a hash of the last body,
+    so unchanged feeds are neither downloaded nor parsed again.
+
+    With defer=True, put() only stages the validators until commit(): a run
+    that fails before storing what it parsed fetches those feeds in full again.
+    """
+
+    def __init__(self, path: str = STATE_DB, defer: bool = False):
+        self.defer = defer
+        self.pending = {}   # url -> (etag, last_modified, digest) staged until commit()
+        self.path = path
+        self.conn = state_db.connect(path)
+
+    def get(self, url: str):
+        if url in self.pending:
+            return self.pending[url]
+        row = self.conn.execute(
+            "SELECT etag, last_modified, body_hash FROM feed_validators WHERE url = ?", (url,)
+        ).fetchone()
+        return row or (None, None, None)
+
+    def request_headers(self, url: str) -> dict:
+        etag, last_modified, _ = self.get(url)
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        return headers
+
+    def put(self, url: str, etag, last_modified, digest):
+        if self.defer:
+            self.pending[url] = (etag, last_modified, digest)
+            return
+        self._write([(url, etag, last_modified, digest)])
+
+    def commit(self):
+        """Save the validators staged by a deferred cache."""
+        rows = [(url, *validators) for url, validators in self.pending.items()]
+        self.pending = {}
+        if rows:
+            self._write(rows)
+
+    def _write(self, rows):
+        now = datetime.now(timezone.utc).isoformat()
+        self.conn.executemany("""
+            INSERT INTO feed_validators (url, etag, last_modified, body_hash, checked_at)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(url) DO UPDATE SET
+                etag = excluded.etag,
+                last_modified = excluded.last_modified,
+                body_hash = excluded.body_hash,
+                checked_at = excluded.checked_at
+        """, [(*row, now) for row in rows])
+        self.conn.commit()
+
+    def close(self):
+        state_db.release(self.path)
@@ -0,0 +1,104 @@
+import asyncio
+from urllib.parse import urlsplit
+
+import httpx
+from metrics import outbound, FEED_FETCHES
+from scrapers.feed_cache import body_hash
+
+# ✅ Ingestion limits (one shared pooled client per run)
+HEADERS = {"User-Agent": "Mozilla/5.0"}
+REQUEST_TIMEOUT = 10   # seconds per request
+RUN_TIMEOUT = 60       # seconds for the whole run
+MAX_PER_HOST = 4       # concurrent requests against a single host
+MAX_CONNECTIONS = 20   # pool size shared by every host
+
+
+def make_client() -> httpx.AsyncClient:
+    """Pooled async HTTP client shared by every fetch of a run."""
+    return httpx.AsyncClient(
+        headers=HEADERS,
+        timeout=REQUEST_TIMEOUT,
+        follow_redirects=True,
+        limits=httpx.Limits(
+            max_connections=MAX_CONNECTIONS,
+            max_keepalive_connections=MAX_CONNECTIONS,
+        ),
+    )
+
+
+async def fetch_all(urls: dict, run_timeout: float = RUN_TIMEOUT,
+                    per_host: int = MAX_PER_HOST, http: httpx.AsyncClient = None,
+                    cache=None, service: str = "rss", operation: str = "fetch_feed",
+                    counter=FEED_FETCHES):
+    """
+    Fetch every URL in `urls` ({key: url}) at once.
+
+    With a `FeedCache`, requests are conditional and feeds answering 304 (or
+    returning a body identical to the last run) are left out of the result.
+    Returns ({key: body_text}, stats) for the fetches that changed and finished
+    before `run_timeout`. `service`/`operation` label the outbound metrics;
+    results are counted in `counter` (None to skip).
+    """
+    host_limits = {}
+    stats = {"fetched": 0, "not_modified": 0, "unchanged": 0, "failed": 0, "bytes": 0}
+
+    async def fetch_one(url: str):
+        host = urlsplit(url).netloc
+        limit = host_limits.setdefault(host, asyncio.Semaphore(per_host))
+        headers = cache.request_headers(url) if cache else {}
+        async with limit:
+            with outbound(service, operation):
+                res = await http.get(url, headers=headers)
+                if res.status_code != 304:
+                    res.raise_for_status()
+
+        if res.status_code == 304:
+            stats["not_modified"] += 1
+            return None
+        stats["bytes"] += len(res.content)
+
+        if cache:
+            digest = body_hash(res.content)
+            unchanged = cache.get(url)[2] == digest
+            cache.put(url, res.headers.get("etag"), res.headers.get("last-modified"), digest)
+            if unchanged:
+                stats["unchanged"] += 1
+                return None
+
+        stats["fetched"] += 1
+        return res.text
+
+    own_client = http is None
+    if own_client:
+        http = make_client()
+
+    try:
+        tasks = {asyncio.create_task(fetch_one(url)): key for key, url in urls.items()}
+        if not tasks:
+            return {}, stats
+
+        done, pending = await asyncio.wait(tasks, timeout=run_timeout)
+
+        for task in pending:
+            task.cancel()
+            stats["failed"] += 1
+            print(f"⏱️ Timed out fetching {tasks[task]} (run limit {run_timeout}s)")
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        bodies = {}
+        for task in done:
+            key = tasks[task]
+            if task.exception():
+                stats["failed"] += 1
+                print(f"⚠️ Failed to fetch {key}: {task.exception()}")
+            elif task.result() is not None:
+                bodies[key] = task.result()
+
+        for result in ("fetched", "not_modified", "unchanged", "failed"):
+            if stats[result] and counter is not None:
+                counter.inc(result, amount=stats[result])
+        return bodies, stats
+    finally:
+        if own_client:
+            await http.aclose()
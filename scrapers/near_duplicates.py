@@ -0,0 +1,123 @@
+import re
+import hashlib
+from datetime import datetime, timedelta, timezone
+from scrapers import state_db
+from scrapers.state_db import STATE_DB
+
+# ✅ 64-bit SimHash split into 8 × 8-bit bands: any two fingerprints within
+# MAX_DISTANCE ≤ 7 bits share at least one band exactly (pigeonhole), so band
+# lookups find every near-duplicate without comparing all pairs.
+BANDS = 8
+BAND_BITS = 64 // BANDS
+MAX_DISTANCE = BANDS - 1
+KEEP_DAYS = 30   # fingerprints older than this are forgotten
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_PUBLISHER_RE = re.compile(r"\s+[-–|]\s+[^-–|]{1,60}$")   # Google News "Headline - Publisher"
+_STOPWORDS = {"a", "an", "the", "of", "and", "or", "to", "in", "on", "for", "with", "at", "by", "from", "is", "as"}
+
+
+MIN_EXTRA_TOKENS = 5   # shorter description leftovers are just the publisher name
+
+
+def _tokens(text: str) -> list:
+    return [t for t in _TOKEN_RE.findall(text.lower()) if t not in _STOPWORDS]
+
+
+def normalize(title: str, description: str = "") -> list:
+    title = _PUBLISHER_RE.sub("", title or "").lower()
+    # Google News descriptions repeat the headline + publisher; keep only what they add
+    extra = _tokens((description or "").lower().replace(title, " "))
+    return _tokens(title) + (extra if len(extra) >= MIN_EXTRA_TOKENS else [])
+
+
+def simhash(tokens) -> int:
+    """64-bit SimHash over unique tokens (linear; word order does not matter)."""
+    weights = [0] * 64
+    for feature in set(tokens):
+        h = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "big")
+        for bit in range(64):
+            weights[bit] += 1 if h >> bit & 1 else -1
+    return sum(1 << bit for bit in range(64) if weights[bit] > 0)
+
+
+def _bands(fp: int):
+    mask = (1 << BAND_BITS) - 1
+    return [(i, fp >> (i * BAND_BITS) & mask) for i in range(BANDS)]
+
+
+def _to_signed(fp: int) -> int:
+    return fp - (1 << 64) if fp >= 1 << 63 else fp   # SQLite INTEGER is signed 64-bit
+
+
+class NearDuplicateIndex:
+    """
+    SimHash/LSH index over normalized title + description, persisted between
+    runs in the scraper state DB.
+    """
+
+    def __init__(self, path: str = STATE_DB):
+        self.path = path
+        self.conn = state_db.connect(path)
+        cutoff = (datetime.now(timezone.utc) - timedelta(days=KEEP_DAYS)).isoformat()
+        self.conn.execute("DELETE FROM simhash_index WHERE seen_at < ?", (cutoff,))
+        self.conn.commit()
+
+        self.buckets = {}   # (band, value) -> [(fingerprint, owner)]; owner None = earlier run
+        for (fp,) in self.conn.execute("SELECT fingerprint FROM simhash_index"):
+            self._add(fp & (1 << 64) - 1, None)
+
+    def _add(self, fp: int, owner):
+        for band in _bands(fp):
+            self.buckets.setdefault(band, []).append((fp, owner))
+
+    def _match(self, fp: int):
+        """Returns (found, owner) for the first stored fingerprint within MAX_DISTANCE."""
+        for band in _bands(fp):
+            for other, owner in self.buckets.get(band, ()):
+                if bin(fp ^ other).count("1") <= MAX_DISTANCE:
+                    return True, owner
+        return False, None
+
+    def collapse(self, updates) -> list:
+        """
+        Collapse near-duplicate updates into one canonical item whose "products"
+        lists every product it matched. Items matching a story from an earlier
+        run are dropped (they were already enriched and alerted).
+        """
+        canonical = []
+        merged = dropped = 0
+
+        for update in updates:
+            fp = simhash(normalize(update.get("title", ""), update.get("description", "")))
+            found, owner = self._match(fp)
+
+            if found and owner is None:
+                dropped += 1
+                continue
+            if found:
+                product = update.get("product")
+                if product and product not in owner["products"]:
+                    owner["products"].append(product)
+                merged += 1
+                continue
+
+            update = dict(update, products=[update["product"]] if update.get("product") else [])
+            update["fingerprint"] = fp
+            self._add(fp, update)
+            canonical.append(update)
+
+        print(f"🧬 Near-duplicates: {merged} merged into {len(canonical)} stories, {dropped} seen in earlier runs")
+        return canonical
+
+    def save(self, updates):
+        """Persist fingerprints of stored updates (call after the DB commit)."""
+        now = datetime.now(timezone.utc).isoformat()
+        self.conn.executemany(
+            "INSERT INTO simhash_index (fingerprint, link, seen_at) VALUES (?, ?, ?)",
+            [(_to_signed(u["fingerprint"]), u.get("link"), now) for u in updates if "fingerprint" in u],
+        )
+        self.conn.commit()
+
+    def close(self):
+        state_db.release(self.path)
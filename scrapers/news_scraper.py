@@ -1,103 +1,161 @@
-import requests
-import feedparser
+import os
+import asyncio
 from bs4 import BeautifulSoup
+from scrapers.fetcher import fetch_all
+from scrapers.feed_cache import FeedCache
+from scrapers.feed_parser import parse_entries, strip_tags
 
 # ✅ RSS Feed URLs (Google News searches + special categories)
+GOOGLE_NEWS_RSS = os.getenv("GOOGLE_NEWS_RSS", "https://news.google.com/rss/search")
+
 FEED_URLS = {
-    "PFAS": "https://news.google.com/rss/search?q=PFAS",
-    "Soil Remediation": "https://news.google.com/rss/search?q=soil+remediation",
-    "Mining": "https://news.google.com/rss/search?q=mining+gold",
-    "Gold Recovery": "https://news.google.com/rss/search?q=gold+recovery",
-    "Drinking Water": "https://news.google.com/rss/search?q=drinking+water+treatment",
-    "Wastewater Treatment": "https://news.google.com/rss/search?q=wastewater+treatment",
-    "Air & Gas Purification": "https://news.google.com/rss/search?q=air+gas+purification",
-    "Mercury Removal": "https://news.google.com/rss/search?q=mercury+removal",
-    "Food & Beverage": "https://news.google.com/rss/search?q=food+beverage+filtration",
-    "Energy Storage": "https://news.google.com/rss/search?q=energy+storage+carbon",
-    "Catalyst Support": "https://news.google.com/rss/search?q=catalyst+support+carbon",
-    "Automotive Filters": "https://news.google.com/rss/search?q=automotive+carbon+filter",
-    "Medical & Pharma": "https://news.google.com/rss/search?q=medical+pharma+carbon",
-    "Nuclear Applications": "https://news.google.com/rss/search?q=nuclear+carbon+filter",
-    "EDLC": "https://news.google.com/rss/search?q=supercapacitor+EDLC",
-    "Silicon Anodes": "https://news.google.com/rss/search?q=silicon+anodes+battery",
-    "Lithium Iron Batteries": "https://news.google.com/rss/search?q=lithium+iron+phosphate+battery",
-    "Carbon Block Filters": "https://news.google.com/rss/search?q=activated+carbon+block+filters",
+    "PFAS": f"{GOOGLE_NEWS_RSS}?q=PFAS",
+    "Soil Remediation": f"{GOOGLE_NEWS_RSS}?q=soil+remediation",
+    "Mining": f"{GOOGLE_NEWS_RSS}?q=mining+gold",
+    "Gold Recovery": f"{GOOGLE_NEWS_RSS}?q=gold+recovery",
+    "Drinking Water": f"{GOOGLE_NEWS_RSS}?q=drinking+water+treatment",
+    "Wastewater Treatment": f"{GOOGLE_NEWS_RSS}?q=wastewater+treatment",
+    "Air & Gas Purification": f"{GOOGLE_NEWS_RSS}?q=air+gas+purification",
+    "Mercury Removal": f"{GOOGLE_NEWS_RSS}?q=mercury+removal",
+    "Food & Beverage": f"{GOOGLE_NEWS_RSS}?q=food+beverage+filtration",
+    "Energy Storage": f"{GOOGLE_NEWS_RSS}?q=energy+storage+carbon",
+    "Catalyst Support": f"{GOOGLE_NEWS_RSS}?q=catalyst+support+carbon",
+    "Automotive Filters": f"{GOOGLE_NEWS_RSS}?q=automotive+carbon+filter",
+    "Medical & Pharma": f"{GOOGLE_NEWS_RSS}?q=medical+pharma+carbon",
+    "Nuclear Applications": f"{GOOGLE_NEWS_RSS}?q=nuclear+carbon+filter",
+    "EDLC": f"{GOOGLE_NEWS_RSS}?q=supercapacitor+EDLC",
+    "Silicon Anodes": f"{GOOGLE_NEWS_RSS}?q=silicon+anodes+battery",
+    "Lithium Iron Batteries": f"{GOOGLE_NEWS_RSS}?q=lithium+iron+phosphate+battery",
+    "Carbon Block Filters": f"{GOOGLE_NEWS_RSS}?q=activated+carbon+block+filters",
 
     # ✅ New Activated Carbon categories
-    "Activated Carbon for Gold Recovery": "https://news.google.com/rss/search?q=activated+carbon+gold+recovery",
-    "Activated Carbon for EDLC": "https://news.google.com/rss/search?q=activated+carbon+EDLC",
-    "Activated Carbon for Silicon Anodes": "https://news.google.com/rss/search?q=activated+carbon+silicon+anodes",
+    "Activated Carbon for Gold Recovery": f"{GOOGLE_NEWS_RSS}?q=activated+carbon+gold+recovery",
+    "Activated Carbon for EDLC": f"{GOOGLE_NEWS_RSS}?q=activated+carbon+EDLC",
+    "Activated Carbon for Silicon Anodes": f"{GOOGLE_NEWS_RSS}?q=activated+carbon+silicon+anodes",
 
     # ✅ Haycarb news via Google News
-    "Haycarb Updates": "https://news.google.com/rss/search?q=Haycarb"
+    "Haycarb Updates": f"{GOOGLE_NEWS_RSS}?q=Haycarb"
 }
 
 
+# ✅ Entries kept per Google News feed (parsing stops there)
+ENTRIES_PER_FEED = 10
+
+
 def clean_html(raw_html: str) -> str:
-    """Remove HTML tags and return plain text."""
-    if not raw_html:
-        return ""
-    return BeautifulSoup(raw_html, "html.parser").get_text(" ", strip=True)
+    """Remove HTML tags and return plain text (regex pass, no DOM)."""
+    return strip_tags(raw_html)
 
 
 # ✅ Scraper for Jacobi website (still homepage-based)
-def scrape_jacobi():
-    url = "https://www.jacobi.net/"
-    try:
-        res = requests.get(url, timeout=10, headers={"User-Agent": "Mozilla/5.0"})
-        soup = BeautifulSoup(res.text, "html.parser")
-        items = []
-        for a in soup.find_all("a", href=True)[:5]:
-            text = a.get_text(strip=True)
-            if text:
-                items.append({
-                    "title": text,
-                    "description": "Update from Jacobi website",
-                    "pub_date": "",
-                    "link": a["href"] if a["href"].startswith("http") else url + a["href"],
-                    "source": "Jacobi",
-                    "product": "Jacobi Updates",
-                })
-        return items
-    except Exception as e:
-        return [{
-            "title": f"Error fetching Jacobi: {e}",
-            "description": "",
-            "pub_date": "",
-            "link": url,
-            "source": "Jacobi",
-            "product": "Jacobi Updates",
-        }]
-
-
-def scrape_updates():
-    """Scrape Google News feeds + Jacobi homepage."""
+JACOBI_URL = os.getenv("JACOBI_URL", "https://www.jacobi.net/")
+
+
+def parse_jacobi(html: str):
+    soup = BeautifulSoup(html, "html.parser")
+    items = []
+    for a in soup.find_all("a", href=True)[:5]:
+        text = a.get_text(strip=True)
+        if text:
+            items.append({
+                "title": text,
+                "description": "Update from Jacobi website",
+                "pub_date": "",
+                "link": a["href"] if a["href"].startswith("http") else JACOBI_URL + a["href"],
+                "source": "Jacobi",
+                "product": "Jacobi Updates",
+                "feed": "Jacobi",
+            })
+    return items
+
+
+def jacobi_error(e):
+    return [{
+        "title": f"Error fetching Jacobi: {e}",
+        "description": "",
+        "pub_date": "",
+        "link": JACOBI_URL,
+        "source": "Jacobi",
+        "product": "Jacobi Updates",
+        "feed": "Jacobi",
+    }]
+
+
+def parse_feed(product: str, body: str):
     updates = []
-    headers = {"User-Agent": "Mozilla/5.0"}
+    for entry in parse_entries(body, limit=ENTRIES_PER_FEED):
+        if not entry["link"]:
+            continue
+        updates.append({
+            "title": entry["title"],
+            "description": clean_html(entry["summary"]),
+            "pub_date": entry["published"],
+            "link": entry["link"],
+            "guid": entry["id"],
+            "source": product,
+            "product": product,
+            "feed": product,   # ✅ checkpoint key (FEED_URLS name)
+        })
+
+    print(f"✅ Parsed {len(updates)} entries for {product}")
+    return updates
 
-    # ✅ Loop over feeds
-    for product, url in FEED_URLS.items():
-        try:
-            resp = requests.get(url, headers=headers, timeout=10)
-            resp.raise_for_status()
-            feed = feedparser.parse(resp.text)
-
-            for entry in feed.entries[:10]:
-                updates.append({
-                    "title": entry.title,
-                    "description": clean_html(getattr(entry, "summary", "")),
-                    "pub_date": getattr(entry, "published", ""),
-                    "link": entry.link,
-                    "source": product,
-                    "product": product,
-                })
-
-            print(f"✅ Parsed {len(feed.entries)} entries for {product}")
 
+# ✅ Stats of the last run (feeds served from the validator cache etc.)
+last_run_stats = {}
+
+
+def report_cache_stats(stats: dict, total: int):
+    cached = stats["not_modified"] + stats["unchanged"]
+    print(
+        f"♻️ {cached}/{total} feeds served from cache "
+        f"({stats['not_modified']} × 304, {stats['unchanged']} unchanged body), "
+        f"{stats['fetched']} parsed, {stats['failed']} failed, "
+        f"{stats['bytes'] / 1024:.0f} KB downloaded"
+    )
+
+
+async def scrape_updates_async(use_cache: bool = True, cache: FeedCache = None):
+    """
+    Fetch all Google News feeds + Jacobi homepage concurrently.
+    Feeds that did not change since the previous run are skipped.
+    A `cache` passed in stays open and is committed by the caller (run_daily.py
+    does so once the updates are stored).
+    """
+    urls = dict(FEED_URLS)
+    urls["Jacobi"] = JACOBI_URL
+    own_cache = cache is None and use_cache
+    if own_cache:
+        cache = FeedCache()
+    try:
+        bodies, stats = await fetch_all(urls, cache=cache)
+    finally:
+        if own_cache:
+            cache.close()
+
+    last_run_stats.clear()
+    last_run_stats.update(stats)
+    report_cache_stats(stats, len(urls))
+
+    updates = []
+    for product in FEED_URLS:
+        if product not in bodies:
+            continue
+        try:
+            updates.extend(parse_feed(product, bodies[product]))
         except Exception as e:
-            print(f"⚠️ Failed to fetch {product}: {e}")
+            print(f"⚠️ Failed to parse {product}: {e}")
 
-    # ✅ Add Jacobi homepage scraping
-    updates.extend(scrape_jacobi())
+    # ✅ Add Jacobi homepage scraping (absent when unchanged or failed)
+    if "Jacobi" in bodies:
+        try:
+            updates.extend(parse_jacobi(bodies["Jacobi"]))
+        except Exception as e:
+            updates.extend(jacobi_error(e))
 
     return updates
+
+
+def scrape_updates(use_cache: bool = True):
+    """Scrape Google News feeds + Jacobi homepage (sync wrapper for run_daily.py)."""
+    return asyncio.run(scrape_updates_async(use_cache))
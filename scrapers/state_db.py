@@ -0,0 +1,70 @@
+import os
+import sqlite3
+
+from db import PRAGMAS
+
+# ✅ On-disk scraper state (feed validators, checkpoints, fingerprints, article text):
+# one connection per process, tuned like the main store, schema created once
+STATE_DB = os.getenv("SCRAPER_STATE_DB", "scraper_state.db")
+
+SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS feed_validators (
+        url TEXT PRIMARY KEY,
+        etag TEXT,
+        last_modified TEXT,
+        body_hash TEXT,
+        checked_at TEXT
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS feed_checkpoints (
+        feed TEXT PRIMARY KEY,
+        newest_epoch INTEGER,
+        seen TEXT NOT NULL,
+        updated_at TEXT
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS simhash_index (
+        fingerprint INTEGER,
+        link TEXT,
+        seen_at TEXT
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS article_text (
+        url_hash TEXT PRIMARY KEY,
+        text TEXT NOT NULL,
+        extracted_at TEXT
+    )
+    """,
+]
+
+_open = {}   # path -> [connection, users]
+
+
+def connect(path: str = STATE_DB) -> sqlite3.Connection:
+    """The shared connection to `path`, opened, tuned and given its tables on first use; pair with release()."""
+    entry = _open.get(path)
+    if entry is None:
+        conn = sqlite3.connect(path, check_same_thread=False)
+        for name, value in PRAGMAS:
+            conn.execute(f"PRAGMA {name}={value};")
+        for ddl in SCHEMA:
+            conn.execute(ddl)
+        conn.commit()
+        entry = _open[path] = [conn, 0]
+    entry[1] += 1
+    return entry[0]
+
+
+def release(path: str = STATE_DB):
+    """Drop one user of `path`'s connection; the last one closes it."""
+    entry = _open.get(path)
+    if entry is None:
+        return
+    entry[1] -= 1
+    if entry[1] <= 0:
+        del _open[path]
+        entry[0].close()
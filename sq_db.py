@@ -1,9 +1,10 @@
 import sqlite3
+from db import DB_NAME
 
-conn = sqlite3.connect("market_scout.db")
+conn = sqlite3.connect(DB_NAME)
 cur = conn.cursor()
 
-cur.execute("SELECT product, COUNT(*) FROM opportunities GROUP BY product;")
+cur.execute("SELECT kind, product, COUNT(*) FROM articles GROUP BY kind, product;")
 rows = cur.fetchall()
 print(rows)
 
@@ -0,0 +1,49 @@
+import asyncio
+
+import pytest
+
+import db
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    """A fresh scout DB in tmp_path (no legacy stores to import)."""
+    monkeypatch.setattr(db, "DB_NAME", str(tmp_path / "scout.db"))
+    monkeypatch.setattr(db, "LEGACY_STORES", [])
+    yield
+    asyncio.run(db.close_db())
+
+
+def article(title, summary="summary", link=None):
+    return {"title": title, "summary": summary, "source": "feed", "date": "2025-01-01T00:00:00Z",
+            "link": link or f"https://example.test/{abs(hash(title))}"}
+
+
+def test_search_highlights_escape_stored_markup(store):
+    async def scenario():
+        await db.insert_articles_bulk("PFAS", [
+            article("PFAS <script>alert(1)</script> story", "<b>bold</b> script & more"),
+        ])
+        results, _ = await db.search_articles("script")
+        return results
+
+    [hit] = asyncio.run(scenario())
+    assert hit["title_highlight"] == "PFAS &lt;<mark>script</mark>&gt;alert(1)&lt;/<mark>script</mark>&gt; story"
+    assert "<b>" not in hit["snippet"] and "&lt;b&gt;bold&lt;/b&gt; <mark>script</mark> &amp; more" in hit["snippet"]
+    assert hit["title"] == "PFAS <script>alert(1)</script> story"   # plain text, as stored
+
+
+def test_collapsed_story_listed_under_every_product(store):
+    async def scenario():
+        await db.insert_opportunities([{**article("Mine tailings gold recovery", link="https://example.test/1"),
+                                        "product": "Mining", "products": ["Mining", "Gold Recovery"]}])
+        await db.insert_articles_bulk("Gold Recovery", [article("Cyanide-free leaching", link="https://example.test/2")])
+        gold, _ = await db.query_articles("Gold Recovery", 0)
+        mining, _ = await db.query_articles("Mining", 0)
+        cached = await db.get_cached_articles("Gold Recovery")
+        return gold, mining, cached
+
+    gold, mining, cached = asyncio.run(scenario())
+    assert [a["link"] for a in gold] == ["https://example.test/2", "https://example.test/1"]   # same epoch: newest id first
+    assert [a["link"] for a in mining] == ["https://example.test/1"]
+    assert {a["link"] for a in cached} == {"https://example.test/1", "https://example.test/2"}
@@ -0,0 +1,20 @@
+import pytest
+from bs4 import BeautifulSoup
+
+from scrapers.feed_parser import strip_tags
+
+
+@pytest.mark.parametrize("raw", [
+    "a < b and c > d <p>para</p>",
+    "x<y and y>z",
+    "1 <2 & 3> 0",
+    '<a href="https://example.test/?q=1&amp;r=2">PFAS</a>&nbsp;<font color="#6f6f6f">Reuters</font>',
+    "<p>kept</p><script>var x = '<b>dropped</b>';</script><style>p { x: 1 }</style>",
+    "before<!-- <b>comment</b> -->after",
+    "&lt;b&gt;escaped markup stays text&lt;/b&gt;",
+    "<br/>line<BR>break</P>",
+    "plain text",
+])
+def test_strip_tags_matches_html_parser(raw):
+    expected = BeautifulSoup(raw, "html.parser").get_text(" ", strip=True)
+    assert strip_tags(raw).split() == expected.split()
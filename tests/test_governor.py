@@ -0,0 +1,121 @@
+import time
+import asyncio
+
+import httpx
+import pytest
+
+from governor import Governor, CircuitOpen
+
+
+def http_error(status: int, retry_after: str = None):
+    headers = {"Retry-After": retry_after} if retry_after else {}
+    request = httpx.Request("POST", "https://upstream.test/")
+    response = httpx.Response(status, headers=headers, request=request)
+    return httpx.HTTPStatusError(f"{status}", request=request, response=response)
+
+
+def make_governor(**overrides):
+    settings = dict(rate=100, burst=10, max_concurrency=2, target_latency=1, timeout=1, deadline=0.5,
+                    retries=0, failure_threshold=2, cooldown=0.05)
+    settings.update(overrides)
+    return Governor("test", **settings)
+
+
+def failing(exc):
+    async def fn():
+        raise exc
+    return fn
+
+
+async def ok():
+    return "ok"
+
+
+async def open_breaker(gov, last_error):
+    """Two failures open the breaker; wait for the cooldown so the next call is the probe."""
+    for exc in (http_error(503), last_error):
+        with pytest.raises(httpx.HTTPStatusError):
+            await gov.call(failing(exc), "op")
+    assert gov.state == "open"
+    await asyncio.sleep(gov.cooldown + 0.01)
+    assert gov.state == "half_open"
+
+
+def test_probe_hitting_the_deadline_in_the_token_wait_frees_the_breaker():
+    async def scenario():
+        gov = make_governor()
+        await open_breaker(gov, http_error(429, retry_after="30"))   # pauses the bucket past the deadline
+
+        with pytest.raises(asyncio.TimeoutError):
+            await gov.call(ok, "op")                                # the probe gives up waiting for a token
+        assert not gov._probing
+
+        gov._paused_until = 0.0                                     # upstream recovered
+        assert await gov.call(ok, "op") == "ok"                     # the next call is a new probe
+        assert gov.state == "closed"
+
+    asyncio.run(scenario())
+
+
+def test_probe_cancelled_while_waiting_for_a_token_frees_the_breaker():
+    async def scenario():
+        gov = make_governor(deadline=60)
+        await open_breaker(gov, http_error(429, retry_after="30"))
+
+        probe = asyncio.create_task(gov.call(ok, "op"))
+        await asyncio.sleep(0.02)                                   # parked in the token wait
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+        assert not gov._probing
+
+        gov._paused_until = 0.0
+        assert await gov.call(ok, "op") == "ok"
+
+    asyncio.run(scenario())
+
+
+def test_probe_cancelled_while_waiting_for_a_slot_frees_the_breaker():
+    async def scenario():
+        gov = make_governor(deadline=60)
+        await open_breaker(gov, http_error(503))
+        gov.in_flight = int(gov.limit)                              # every slot taken
+
+        probe = asyncio.create_task(gov.call(ok, "op"))
+        await asyncio.sleep(0.02)                                   # parked in _acquire()
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+        assert not gov._probing
+
+        gov.in_flight = 0
+        assert await gov.call(ok, "op") == "ok"
+
+    asyncio.run(scenario())
+
+
+def test_sync_probe_hitting_the_deadline_frees_the_breaker():
+    gov = make_governor()
+    for exc in (http_error(503), http_error(429, retry_after="30")):
+        with pytest.raises(httpx.HTTPStatusError):
+            gov.call_sync(lambda exc=exc: (_ for _ in ()).throw(exc), "op")
+    time.sleep(gov.cooldown + 0.01)
+
+    with pytest.raises(TimeoutError):
+        gov.call_sync(lambda: "ok", "op")
+    assert not gov._probing
+
+    gov._paused_until = 0.0
+    assert gov.call_sync(lambda: "ok", "op") == "ok"
+
+
+def test_calls_fail_fast_while_open():
+    async def scenario():
+        gov = make_governor(cooldown=30)
+        for _ in range(2):
+            with pytest.raises(httpx.HTTPStatusError):
+                await gov.call(failing(http_error(503)), "op")
+        with pytest.raises(CircuitOpen):
+            await gov.call(ok, "op")
+
+    asyncio.run(scenario())
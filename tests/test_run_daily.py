@@ -0,0 +1,22 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from run_daily import parse_pub_date
+
+
+@pytest.mark.parametrize("raw", [
+    "Tue, 14 Oct 2025 08:30:00 GMT",        # Google News RSS
+    "Tue, 14 Oct 2025 10:30:00 +0200",
+    "2025-10-14T08:30:00Z",                 # Atom (EPA)
+    "2025-10-14T04:30:00-04:00",
+])
+def test_parse_pub_date_is_utc(raw):
+    assert parse_pub_date(raw) == datetime(2025, 10, 14, 8, 30, tzinfo=timezone.utc)
+
+
+@pytest.mark.parametrize("raw", ["", None, "yesterday"])
+def test_unparsable_pub_date_falls_back_to_utc_now(raw):
+    parsed = parse_pub_date(raw)
+    assert parsed.tzinfo is not None
+    assert abs((datetime.now(timezone.utc) - parsed).total_seconds()) < 5
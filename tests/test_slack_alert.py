@@ -0,0 +1,162 @@
+import time
+import asyncio
+
+import httpx
+import pytest
+
+from alerts import slack_alert
+from alerts.slack_alert import SlackDigestDispatcher
+from governor import Governor
+
+URL = "https://hooks.slack.test/services/T/B/X"
+
+
+class Webhook:
+    """Local stand-in for a Slack incoming webhook: records posts, answers from `responses` then 200."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.posts = []   # (monotonic time, text)
+        self.transport = httpx.MockTransport(self.handle)
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        self.posts.append((time.monotonic(), httpx.Response(200, content=request.content).json()["text"]))
+        return self.responses.pop(0) if self.responses else httpx.Response(200, text="ok")
+
+    def digests(self, product=None):
+        return [text for _, text in self.posts if product is None or f": {product}*" in text]
+
+
+@pytest.fixture
+def slack(monkeypatch):
+    """A fast, private governor in place of governor.SLACK."""
+    gov = Governor("slack", rate=100, burst=10, max_concurrency=1, target_latency=1, timeout=1,
+                   deadline=5, retries=2, failure_threshold=1, cooldown=0.2, backoff_base=0.01)
+    monkeypatch.setattr(slack_alert, "SLACK", gov)
+    return gov
+
+
+async def wait_for(condition, timeout=2.0):
+    give_up = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < give_up, "condition not met in time"
+        await asyncio.sleep(0.01)
+
+
+def test_digests_group_per_product_up_to_max_items(slack):
+    async def scenario():
+        hook = Webhook()
+        dispatcher = SlackDigestDispatcher(URL, max_items=3, window=30, transport=hook.transport)
+        dispatcher.start()
+        for n in range(7):
+            dispatcher.alert("PFAS", f"pfas {n}", f"https://example.test/pfas/{n}")
+        dispatcher.alert("Mining", "mining 0")
+        await wait_for(lambda: len(hook.digests("PFAS")) == 2)
+        await asyncio.sleep(0.05)
+        early = list(hook.digests())
+        await dispatcher.close()
+        return early, hook, dispatcher.stats
+
+    early, hook, stats = asyncio.run(scenario())
+    assert [text.count("\n• ") for text in early] == [3, 3]   # full digests go out at once, the rest waits
+    assert "3 new updates: PFAS" in early[0] and "<https://example.test/pfas/0|pfas 0>" in early[0]
+    assert sorted(hook.digests()[2:]) == ["🚨 *1 new update: Mining*\n• mining 0",
+                                          "🚨 *1 new update: PFAS*\n• <https://example.test/pfas/6|pfas 6>"]
+    assert stats["sent"] == 8 and stats["digests"] == 4 and stats["failed"] == 0
+
+
+def test_window_sends_partial_digest(slack):
+    async def scenario():
+        hook = Webhook()
+        dispatcher = SlackDigestDispatcher(URL, max_items=10, window=0.2, transport=hook.transport)
+        dispatcher.start()
+        started = time.monotonic()
+        dispatcher.alert("PFAS", "first")
+        await asyncio.sleep(0.05)
+        dispatcher.alert("PFAS", "second")
+        await wait_for(lambda: hook.posts)
+        await dispatcher.close()
+        return hook, hook.posts[0][0] - started
+
+    hook, waited = asyncio.run(scenario())
+    assert 0.2 <= waited < 1.0   # due one window after the first alert, not the last
+    assert hook.digests() == ["🚨 *2 new updates: PFAS*\n• first\n• second"]
+
+
+def test_429_is_retried_after_retry_after(slack):
+    async def scenario():
+        hook = Webhook(httpx.Response(429, headers={"Retry-After": "0.3"}))
+        dispatcher = SlackDigestDispatcher(URL, max_items=1, window=30, transport=hook.transport)
+        dispatcher.start()
+        dispatcher.alert("PFAS", "throttled")
+        await wait_for(lambda: len(hook.posts) == 2)
+        await dispatcher.close()
+        return hook, dispatcher.stats
+
+    hook, stats = asyncio.run(scenario())
+    assert hook.posts[1][0] - hook.posts[0][0] >= 0.3
+    assert hook.posts[0][1] == hook.posts[1][1]
+    assert stats["sent"] == 1 and stats["failed"] == 0 and slack.stats["throttled"] == 1
+
+
+def test_alert_never_blocks_and_drops_when_full(slack):
+    async def scenario():
+        hook = Webhook()
+        dispatcher = SlackDigestDispatcher(URL, max_items=1, window=30, queue_size=2, transport=hook.transport)
+        dispatcher.start()
+        started = time.perf_counter()
+        accepted = [dispatcher.alert("PFAS", f"alert {n}") for n in range(5)]   # the sender has not run yet
+        elapsed = time.perf_counter() - started
+        await dispatcher.close()
+        return accepted, elapsed, dispatcher.stats
+
+    accepted, elapsed, stats = asyncio.run(scenario())
+    assert accepted == [True, True, False, False, False]
+    assert elapsed < 0.05
+    assert stats["queued"] == 2 and stats["dropped"] == 3 and stats["sent"] == 2
+
+
+def test_close_flushes_pending(slack):
+    async def scenario():
+        hook = Webhook()
+        dispatcher = SlackDigestDispatcher(URL, max_items=10, window=3600, transport=hook.transport)
+        dispatcher.start()
+        for product in ("PFAS", "Mining", "PFAS"):
+            dispatcher.alert(product, f"{product} news")
+        await asyncio.sleep(0.05)
+        before = len(hook.posts)
+        await dispatcher.close(timeout=2)
+        return before, hook, dispatcher
+
+    before, hook, dispatcher = asyncio.run(scenario())
+    assert before == 0
+    assert sorted(hook.digests()) == ["🚨 *1 new update: Mining*\n• Mining news",
+                                      "🚨 *2 new updates: PFAS*\n• PFAS news\n• PFAS news"]
+    assert dispatcher.task is None and not dispatcher.pending
+
+
+def test_digests_held_while_breaker_open(slack):
+    async def scenario():
+        async def down():
+            raise httpx.ConnectError("down")
+        slack.retries = 0
+        with pytest.raises(httpx.ConnectError):
+            await slack.call(down, "digest")   # failure_threshold=1: the breaker opens
+        slack.retries = 2
+        assert slack.state == "open"
+
+        hook = Webhook()
+        dispatcher = SlackDigestDispatcher(URL, max_items=1, window=30, transport=hook.transport)
+        dispatcher.start()
+        started = time.monotonic()
+        dispatcher.alert("PFAS", "held")
+        await asyncio.sleep(0.1)
+        held = (len(hook.posts), set(dispatcher._held))
+        await wait_for(lambda: hook.posts, timeout=3)
+        await dispatcher.close()
+        return held, hook.posts[0][0] - started, dispatcher.stats
+
+    (posted_while_open, held), waited, stats = asyncio.run(scenario())
+    assert posted_while_open == 0 and held == {"PFAS"}
+    assert waited >= slack.cooldown
+    assert stats["sent"] == 1 and stats["failed"] == 0 and slack.state == "closed"
@@ -0,0 +1,27 @@
+from scrapers import state_db
+from scrapers.article_text import ArticleTextCache
+from scrapers.checkpoints import FeedCheckpoints
+from scrapers.feed_cache import FeedCache
+from scrapers.near_duplicates import NearDuplicateIndex
+
+
+def test_scraper_state_shares_one_tuned_connection(tmp_path):
+    path = str(tmp_path / "scraper_state.db")
+    stores = [FeedCache(path, defer=True), FeedCheckpoints(path), NearDuplicateIndex(path), ArticleTextCache(path)]
+    conn = stores[0].conn
+    assert all(store.conn is conn for store in stores)
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1   # NORMAL
+
+    stores[0].put("https://feed.test/rss", '"v1"', None, "hash")
+    stores[0].commit()
+    stores[3].put_many({"https://example.test/a": "text"})
+    for store in stores[:-1]:
+        store.close()
+    assert stores[3].get_many(["https://example.test/a"]) == {"https://example.test/a": "text"}   # still open
+    stores[3].close()
+    assert path not in state_db._open
+
+    reopened = FeedCache(path)
+    assert reopened.get("https://feed.test/rss") == ('"v1"', None, "hash")
+    reopened.close()
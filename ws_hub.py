@@ -0,0 +1,221 @@
+# ws_hub.py
+import os
+import json
+import time
+import zlib
+import asyncio
+from collections import OrderedDict, deque
+from fastapi import WebSocket
+
+QUEUE_SIZE = int(os.getenv("WS_QUEUE_SIZE", "100"))            # outbound messages buffered per client
+SEND_TIMEOUT = float(os.getenv("WS_SEND_TIMEOUT", "10"))       # seconds before a send counts as stuck
+SLOW_POLICY = os.getenv("WS_SLOW_POLICY", "drop_oldest")       # "drop_oldest" | "disconnect"
+DEFAULT_TOPICS = ["PFAS", "Activated Carbon", "Gold Recovery", "Water Treatment"]
+SEEN_PER_TOPIC = 500                                           # links remembered per topic
+RING_SIZE = int(os.getenv("WS_RING_SIZE", "1000"))             # recent messages kept for ?since= replay
+ENCODINGS = ("json", "zlib")   # zlib: binary frames holding zlib-compressed JSON
+
+
+class Client:
+    """One connected socket with its own bounded outbound queue and sender task."""
+
+    def __init__(self, ws: WebSocket, queue_size: int, topics, encoding: str = "json"):
+        self.ws = ws
+        self.topics = set(topics)
+        self.encoding = encoding
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.task = None
+        self.sent = 0
+        self.dropped = 0
+        self.closed = False
+
+    def stats(self) -> dict:
+        peer = self.ws.client
+        return {
+            "peer": f"{peer.host}:{peer.port}" if peer else None,
+            "topics": sorted(self.topics),
+            "encoding": self.encoding,
+            "queued": self.queue.qsize(),
+            "sent": self.sent,
+            "dropped": self.dropped,
+        }
+
+
+class WebSocketHub:
+    """
+    Fan-out for /ws/updates. deliver() only enqueues a message serialized once,
+    so one slow or half-dead client never delays the others; each client's
+    sender task drains its queue concurrently with every other client.
+
+    Every broadcast carries a monotonic "seq". The last RING_SIZE messages are
+    kept so a client reconnecting with ?since=<seq> gets exactly what it missed,
+    or a {"type": "resync"} when it fell out of the buffer.
+    """
+
+    def __init__(self, queue_size: int = QUEUE_SIZE, slow_policy: str = SLOW_POLICY,
+                 send_timeout: float = SEND_TIMEOUT):
+        self.queue_size = queue_size
+        self.slow_policy = slow_policy
+        self.send_timeout = send_timeout
+        self.clients = set()
+        self.broadcasts = 0
+        self.slow_disconnects = 0
+        self.dropped = 0        # messages dropped for slow consumers, all clients ever
+        self._closing = set()   # keeps scheduled disconnects alive until they finish
+        self.topics_added = asyncio.Event()   # wakes the broadcaster for a newly wanted topic
+        # ✅ Seeded from the clock so ids keep increasing across restarts
+        self.seq = int(time.time() * 1000)
+        self.history = deque(maxlen=RING_SIZE)   # (seq, topic, text)
+
+    async def connect(self, ws: WebSocket, topics=DEFAULT_TOPICS, since: int = None,
+                      encoding: str = "json") -> Client:
+        await ws.accept()
+        client = Client(ws, self.queue_size, topics, encoding if encoding in ENCODINGS else "json")
+        client.task = asyncio.create_task(self._sender(client))
+        if since is not None:
+            self._replay(client, since)
+        self._watch_new_topics(client.topics)
+        self.clients.add(client)
+        return client
+
+    def _replay(self, client: Client, since: int):
+        """Queue the messages after `since` for a reconnecting client (or ask it to resync)."""
+        oldest = self.history[0][0] if self.history else self.seq + 1
+        missed = [(topic, text) for seq, topic, text in self.history if seq > since]
+        matching = [text for topic, text in missed if topic is None or topic in client.topics]
+
+        if since > self.seq or since < oldest - 1 or len(matching) > self.queue_size:
+            self.send(client, {"type": "resync", "seq": self.seq})
+            return
+        for text in matching:
+            self._enqueue(client, self._encode(text, client.encoding))
+
+    def subscribed_topics(self) -> set:
+        """Union of every connected client's topics."""
+        topics = set()
+        for client in self.clients:
+            topics |= client.topics
+        return topics
+
+    def subscribe(self, client: Client, topics):
+        self._watch_new_topics(topics)
+        client.topics.update(topics)
+
+    def unsubscribe(self, client: Client, topics):
+        client.topics.difference_update(topics)
+
+    def _watch_new_topics(self, topics):
+        if set(topics) - self.subscribed_topics():
+            self.topics_added.set()
+
+    def send(self, client: Client, message) -> bool:
+        """Queue a message for one client only (acks etc.), outside the seq stream."""
+        text = message if isinstance(message, str) else json.dumps(message)
+        return self._enqueue(client, self._encode(text, client.encoding))
+
+    @staticmethod
+    def _encode(text: str, encoding: str):
+        return zlib.compress(text.encode("utf-8")) if encoding == "zlib" else text
+
+    async def disconnect(self, client: Client):
+        if client.closed:
+            return
+        client.closed = True
+        self.clients.discard(client)
+        if client.task and client.task is not asyncio.current_task():
+            client.task.cancel()
+        try:
+            await client.ws.close()
+        except Exception:
+            pass  # already gone
+
+    def deliver(self, seq: int, topic: str, text: str) -> int:
+        """
+        Queue an already stamped and serialized message (relayed from the
+        leader worker, see cluster.py); `seq` becomes the hub's seq.
+        """
+        self.seq = seq
+        self.history.append((seq, topic, text))
+        self.broadcasts += 1
+
+        encoded = {"json": text}   # compressed once, only if some client wants it
+        delivered = 0
+        for client in list(self.clients):
+            if topic is not None and topic not in client.topics:
+                continue
+            if client.encoding not in encoded:
+                encoded[client.encoding] = self._encode(text, client.encoding)
+            if self._enqueue(client, encoded[client.encoding]):
+                delivered += 1
+        return delivered
+
+    def preload(self, rows):
+        """Fill the replay buffer with recent (seq, topic, text) rows without sending them."""
+        for seq, topic, text in rows:
+            self.history.append((seq, topic, text))
+            self.seq = seq
+
+    def _enqueue(self, client: Client, payload) -> bool:
+        if client.closed:
+            return False
+        if not client.queue.full():
+            client.queue.put_nowait(payload)
+            return True
+
+        if self.slow_policy == "disconnect":
+            self.slow_disconnects += 1
+            task = asyncio.create_task(self.disconnect(client))
+            self._closing.add(task)
+            task.add_done_callback(self._closing.discard)
+            return False
+
+        # drop_oldest: keep the newest updates for slow consumers
+        client.queue.get_nowait()
+        client.dropped += 1
+        self.dropped += 1
+        client.queue.put_nowait(payload)
+        return True
+
+    async def _sender(self, client: Client):
+        try:
+            while True:
+                payload = await client.queue.get()
+                send = client.ws.send_bytes(payload) if isinstance(payload, bytes) else client.ws.send_text(payload)
+                await asyncio.wait_for(send, self.send_timeout)
+                client.sent += 1
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            print("🔴 WS send failed, dropping client:", e)
+            await self.disconnect(client)
+
+    def stats(self) -> dict:
+        return {
+            "clients": len(self.clients),
+            "seq": self.seq,
+            "buffered": len(self.history),
+            "topics": sorted(self.subscribed_topics()),
+            "broadcasts": self.broadcasts,
+            "slow_policy": self.slow_policy,
+            "slow_disconnects": self.slow_disconnects,
+            "dropped": self.dropped,
+            "connections": [c.stats() for c in self.clients],
+        }
+
+
+class SeenItems:
+    """Per-topic memory of already pushed links, so only new items go out."""
+
+    def __init__(self, per_topic: int = SEEN_PER_TOPIC):
+        self.per_topic = per_topic
+        self._seen = {}   # topic -> OrderedDict of links (insertion order = age)
+
+    def add(self, topic: str, key: str) -> bool:
+        """Remember `key`; returns False if it was already seen for `topic`."""
+        seen = self._seen.setdefault(topic, OrderedDict())
+        if key in seen:
+            return False
+        seen[key] = None
+        if len(seen) > self.per_topic:
+            seen.popitem(last=False)
+        return True